@@ -0,0 +1,99 @@
+"""SQL statements and latency of an iCalendar poll storm against the feed cache.
+
+Seeds ``members`` members enrolled in a few of 20 courses with a week of classes,
+then polls every member feed three times: cold (feeds are built), warm without
+validators, and as calendar clients do with If-None-Match. Run against the
+configured database:
+
+    python benchmarks/bench_calendar_feeds.py [members]
+"""
+import os
+import sys
+import time
+from datetime import datetime, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import calendar_feeds, calendar_token, create_app, db, initialize_database, Course, Instructors, \
+    Room, RoomSchedule, Users, User_Course  # noqa: E402
+
+SEED_BATCH = 50_000
+COURSES = 20
+
+
+def seed(members):
+    if Users.query.get('FEED-0'):
+        return
+    rooms = [room.ID for room in Room.query.all()]
+    db.session.add(Instructors(SSN='FEED-INS', firstName='Feed', lastName='Coach'))
+    db.session.flush()
+    db.session.add_all(Course(courseName=f'FEED-{number}', capacity=99, seatsAvailable=99, isSpecial=False,
+                              InstructorID='FEED-INS', roomId=rooms[number % len(rooms)]) for number in range(COURSES))
+    db.session.commit()
+
+    today = datetime.utcnow().date()
+    db.session.execute(db.insert(RoomSchedule), [
+        {'roomId': rooms[number % len(rooms)], 'scheduleDate': today + timedelta(days=day),
+         'scheduleTime': clock(7 + number // len(rooms)), 'bookingType': 'class', 'courseName': f'FEED-{number}',
+         'isBooked': True, 'durationMinutes': 60}
+        for number in range(COURSES) for day in range(7)])
+    for offset in range(0, members, SEED_BATCH):
+        numbers = range(offset, min(members, offset + SEED_BATCH))
+        db.session.execute(db.insert(Users), [
+            {'SSN': f'FEED-{number}', 'firstName': 'Feed', 'lastName': str(number), 'membershipType': 'rm',
+             'password_hash': 'unused'} for number in numbers])
+        db.session.execute(db.insert(User_Course), [
+            {'courseName': f'FEED-{(number + step) % COURSES}', 'userID': f'FEED-{number}'}
+            for number in numbers for step in range(3)])
+        db.session.commit()
+
+
+def storm(client, engine, paths, etags):
+    """Poll every path once; with ``etags`` as a revalidation, otherwise recording each ETag."""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    codes = {}
+    began = time.perf_counter()
+    try:
+        for path in paths:
+            response = client.get(path, headers={'If-None-Match': etags[path]} if path in etags else {})
+            codes[response.status_code] = codes.get(response.status_code, 0) + 1
+            etags.setdefault(path, response.headers['ETag'])
+            response.close()
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    elapsed = time.perf_counter() - began
+    return len(statements) / len(paths), elapsed / len(paths) * 1000, codes
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    app = create_app({'CALENDAR_CACHE_SIZE': members, 'SLOW_QUERY_MS': 0, 'METRICS_ENABLED': False})
+
+    with app.app_context():
+        initialize_database()
+        seed(members)
+        engine = db.engine
+        paths = [f'/calendars/member/FEED-{number}/{calendar_token("member", f"FEED-{number}")}.ics'
+                 for number in range(members)]
+    client = app.test_client()
+    etags = {}
+
+    print(f'{"poll":<24} {"statements/request":>18} {"ms/request":>10}  status')
+    for label, validators in (('cold (feeds built)', {}), ('warm, no validators', {}),
+                              ('warm, If-None-Match', etags)):
+        per_request, latency, codes = storm(client, engine, paths, validators)
+        if not etags:
+            etags.update(validators)
+        print(f'{label:<24} {per_request:>18.3f} {latency:>10.3f}  {codes}')
+    print(calendar_feeds.stats())
+
+
+if __name__ == '__main__':
+    main()
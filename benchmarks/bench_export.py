@@ -0,0 +1,72 @@
+"""Stream /api/v1/exports/roomschedules over millions of rows and sample process RSS.
+
+Seeds the configured PostgreSQL database (once) and reads the response chunk by
+chunk the way a reporting client would:
+
+    python benchmarks/bench_export.py [rows] [ndjson|csv]
+"""
+import os
+import sys
+import time
+from datetime import date, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db, initialize_database, Room, RoomSchedule  # noqa: E402
+
+SEED_BATCH = 50_000
+
+
+def rss_mb():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def seed(rows):
+    existing = db.session.query(db.func.count(RoomSchedule.scheduleID)).scalar()
+    rooms = [room.ID for room in Room.query.all()]
+    for offset in range(existing, rows, SEED_BATCH):
+        db.session.execute(db.insert(RoomSchedule), [
+            {'roomId': rooms[number % len(rooms)],
+             'scheduleDate': date(2020, 1, 1) + timedelta(days=number // (14 * len(rooms))),
+             'scheduleTime': clock(7 + number // len(rooms) % 14), 'bookingType': 'cleaning', 'isBooked': True,
+             'durationMinutes': 60}
+            for number in range(offset, min(rows, offset + SEED_BATCH))
+        ])
+        db.session.commit()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    output_format = sys.argv[2] if len(sys.argv) > 2 else 'ndjson'
+    app = create_app()
+
+    with app.app_context():
+        initialize_database()
+        seed(rows)
+
+    client = app.test_client()
+    token = client.post('/api/v1/auth/login', json={'SSN': 'ADMIN123', 'password': 'admin123'}).json['token']
+    response = client.get(f'/api/v1/exports/roomschedules?format={output_format}',
+                          headers={'Authorization': f'Bearer {token}'}, buffered=False)
+
+    started = time.perf_counter()
+    baseline = rss_mb()
+    lines = 0
+    next_sample = 0
+    peak = baseline
+    for chunk in response.response:
+        lines += chunk.count(b'\n') if isinstance(chunk, bytes) else chunk.count('\n')
+        peak = max(peak, rss_mb())
+        if lines >= next_sample:
+            print(f'{lines:>10} rows  rss {rss_mb():7.1f} MB')
+            next_sample += 250_000
+    response.close()
+
+    elapsed = time.perf_counter() - started
+    print(f'exported {lines} lines in {elapsed:.1f}s ({lines / elapsed:,.0f} rows/s)')
+    print(f'rss baseline {baseline:.1f} MB  peak {peak:.1f} MB  growth {peak - baseline:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
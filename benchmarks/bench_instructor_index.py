@@ -0,0 +1,116 @@
+"""Instructor "is free at T" checks and the bulk double-booking audit on a large timetable.
+
+Seeds ``rows`` class bookings for ``instructors`` instructors (two courses each, each
+course in its own room) into the configured database, then compares a lookup in
+InstructorScheduleIndex with the equivalent SQL query, and times one audit pass over
+every class booking:
+
+    python benchmarks/bench_instructor_index.py [rows] [instructors]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import audit_instructor_schedules, booking_interval, create_app, db, initialize_database, \
+    InstructorScheduleIndex, Course, Instructors, Room, RoomSchedule  # noqa: E402
+
+SEED_BATCH = 50_000
+CHECKS = 2_000
+FIRST_DAY = date(2024, 1, 1)
+HOURS = range(7, 21)
+
+
+def seed(rows, instructors):
+    if Instructors.query.get('IDX-0'):
+        return
+    # A room per course: classes of different instructors start at different minutes and would overlap in
+    # a shared room, which the database refuses.
+    rooms = [Room(roomName=f'IDX-{number}-{part}') for number in range(instructors) for part in range(2)]
+    db.session.add_all(rooms)
+    db.session.add_all(Instructors(SSN=f'IDX-{number}', firstName='Index', lastName=str(number))
+                       for number in range(instructors))
+    db.session.flush()
+    rooms = [room.ID for room in rooms]
+    db.session.add_all(Course(courseName=f'IDX-{number}-{part}', capacity=20, seatsAvailable=20, isSpecial=False,
+                              InstructorID=f'IDX-{number}', roomId=rooms[2 * number + part])
+                       for number in range(instructors) for part in range(2))
+    db.session.commit()
+
+    # Each instructor teaches one class an hour, alternating between their two courses and rooms.
+    per_day = instructors * len(HOURS)
+    for offset in range(0, rows, SEED_BATCH):
+        batch = []
+        for number in range(offset, min(rows, offset + SEED_BATCH)):
+            instructor, hour = divmod(number % per_day, len(HOURS))
+            part = hour % 2
+            batch.append({'roomId': rooms[2 * instructor + part],
+                          'scheduleDate': FIRST_DAY + timedelta(days=number // per_day),
+                          'scheduleTime': clock(HOURS[hour], instructor * 60 // instructors // 5 * 5),
+                          'bookingType': 'class', 'courseName': f'IDX-{instructor}-{part}', 'isBooked': True,
+                          'durationMinutes': 45})
+        db.session.execute(db.insert(RoomSchedule), batch)
+        db.session.commit()
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    instructors = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = create_app({'SLOW_QUERY_MS': 0})
+
+    with app.app_context():
+        initialize_database()
+        seed(rows, instructors)
+        days = rows // (instructors * len(HOURS)) + 1
+
+        index = InstructorScheduleIndex(ttl=float('inf'))
+        started = time.perf_counter()
+        for number in range(instructors):
+            index.preload(f'IDX-{number}', FIRST_DAY, FIRST_DAY + timedelta(days=days))
+        print(f'indexed {rows} class bookings of {instructors} instructors in {time.perf_counter() - started:.2f}s')
+
+        rng = random.Random(42)
+        checks = [(f'IDX-{rng.randrange(instructors)}', FIRST_DAY + timedelta(days=rng.randrange(days)),
+                   rng.randrange(6 * 60, 21 * 60, 15)) for _ in range(CHECKS)]
+
+        index_samples = []
+        index_busy = 0
+        for instructor_id, day, start in checks:
+            began = time.perf_counter_ns()
+            index_busy += index.find_overlap(instructor_id, day, start, start + 60) is not None
+            index_samples.append((time.perf_counter_ns() - began) / 1000)
+
+        sql_samples = []
+        sql_busy = 0
+        for instructor_id, day, start in checks:
+            began = time.perf_counter_ns()
+            bookings = db.session.execute(
+                db.select(RoomSchedule.scheduleTime, RoomSchedule.durationMinutes, RoomSchedule.bookingType)
+                .join(Course, Course.courseName == RoomSchedule.courseName)
+                .where(Course.InstructorID == instructor_id, RoomSchedule.bookingType == 'class',
+                       RoomSchedule.scheduleDate == day)
+            ).all()
+            sql_busy += any(booking_interval(booking)[0] < start + 60 and booking_interval(booking)[1] > start
+                            for booking in bookings)
+            sql_samples.append((time.perf_counter_ns() - began) / 1000)
+        assert index_busy == sql_busy, (index_busy, sql_busy)
+
+        print(f'{"is free at T":<14} {"p50 us":>10} {"p99 us":>10}  ({CHECKS} checks, {index_busy} busy)')
+        for label, samples in (('index', index_samples), ('SQL query', sql_samples)):
+            print(f'{label:<14} {percentile(samples, 0.50):>10.2f} {percentile(samples, 0.99):>10.2f}')
+
+        started = time.perf_counter()
+        conflicts = sum(1 for _ in audit_instructor_schedules())
+        print(f'audit: {conflicts} overlapping pairs among {rows} bookings in {time.perf_counter() - started:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Latency of other endpoints while a login storm runs, with inline and pooled password hashing.
+
+Serves the app from a threaded server in this process, has ``storm`` threads log in
+back to back and meanwhile probes cheap read endpoints. Runs three phases (idle,
+storm with hashing inline on the request threads, storm with the process pool) against
+the configured PostgreSQL database:
+
+    python benchmarks/bench_login_storm.py [storm_threads] [seconds]
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from app import create_app, initialize_database, password_hasher  # noqa: E402
+
+PROBES = ['/api/v1/rooms', '/api/v1/availability?rooms=1&dateFrom=2030-01-01&dateTo=2030-01-07']
+CREDENTIALS = json.dumps({'SSN': 'ADMIN123', 'password': 'admin123'}).encode()
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def login_loop(base, stop, logins):
+    while not stop.is_set():
+        request = urllib.request.Request(f'{base}/api/v1/auth/login', data=CREDENTIALS,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        logins.append(1)
+
+
+def phase(base, label, storm_threads, seconds):
+    stop = threading.Event()
+    logins = []
+    threads = [threading.Thread(target=login_loop, args=(base, stop, logins)) for _ in range(storm_threads)]
+    for thread in threads:
+        thread.start()
+
+    samples = {url: [] for url in PROBES}
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        for url in PROBES:
+            began = time.perf_counter()
+            with urllib.request.urlopen(base + url) as response:
+                response.read()
+            samples[url].append((time.perf_counter() - began) * 1000)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f'{label}: {len(logins) / seconds:.1f} logins/s')
+    for url, values in samples.items():
+        values.sort()
+        print(f'  {url.split("?")[0]:<22} p50 {percentile(values, 0.50):7.1f} ms'
+              f'  p95 {percentile(values, 0.95):7.1f} ms  p99 {percentile(values, 0.99):7.1f} ms'
+              f'  ({len(values)} requests)')
+
+
+def main():
+    storm_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 4 * (os.cpu_count() or 1)
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    app = create_app()
+
+    with app.app_context():
+        initialize_database()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    pool_workers = password_hasher.workers
+
+    print(f'{os.cpu_count()} cores, {storm_threads} login threads, {password_hasher.method}')
+    phase(base, 'idle', 0, seconds)
+    password_hasher.workers = 0
+    phase(base, 'storm, hashing on request threads', storm_threads, seconds)
+    password_hasher.workers = pool_workers
+    phase(base, f'storm, {pool_workers}-process hashing pool', storm_threads, seconds)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
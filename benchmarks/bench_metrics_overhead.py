@@ -0,0 +1,54 @@
+"""Per-request cost of the request/SQL metrics, measured with them switched on and off.
+
+Alternates rounds with ``request_metrics`` enabled and disabled on endpoints that run
+no SQL, one statement and a page of rows, against the configured database:
+
+    python benchmarks/bench_metrics_overhead.py [requests] [rounds]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, initialize_database, request_metrics  # noqa: E402
+
+ENDPOINTS = ['/api/v1/rooms', '/api/v1/ratings/room/1', '/api/v1/availability?rooms=1']
+
+
+def poll(client, url, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(url).close()
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    app = create_app()
+
+    with app.app_context():
+        initialize_database()
+    client = app.test_client()
+
+    print(f'{"endpoint":<24} {"off µs/req":>11} {"on µs/req":>10} {"overhead µs":>12} {"overhead":>9}')
+    for url in ENDPOINTS:
+        poll(client, url, requests // 10)
+        timings = {False: [], True: []}
+        for _ in range(rounds):
+            for enabled in (False, True):
+                request_metrics.enabled = enabled
+                timings[enabled].append(poll(client, url, requests))
+        off, on = statistics.median(timings[False]), statistics.median(timings[True])
+        print(f'{url.split("?")[0]:<24} {off:>11.1f} {on:>10.1f} {on - off:>12.1f} {(on - off) / off:>9.1%}')
+
+    request_metrics.enabled = True
+    exposition = client.get('/api/v1/metrics').get_data(as_text=True)
+    series = sum(line.endswith('_count') or '_count{' in line for line in exposition.splitlines())
+    print(f'/api/v1/metrics: {len(exposition)} bytes, {series} series')
+
+
+if __name__ == '__main__':
+    main()
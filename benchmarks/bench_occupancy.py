@@ -0,0 +1,113 @@
+"""Full rebuild of the room occupancy matrix on millions of bookings, numpy vs a plain Python loop.
+
+Seeds ``rows`` bookings of mixed types and lengths into a throwaway SQLite file (or, once,
+into the database passed as --database), times rebuild_room_occupancy() against the same accumulation done booking by booking
+with add_occupancy(), checks both produce the same cells, and times the incremental
+upsert one booking pays on insert:
+
+    python benchmarks/bench_occupancy.py [--database URL] [--rows 2000000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import add_occupancy, apply_occupancy, create_app, db, initialize_database, rebuild_room_occupancy, \
+    OCCUPANCY_COLUMNS, OCCUPANCY_TYPES, Room, RoomOccupancy, RoomSchedule  # noqa: E402
+
+SEED_BATCH = 50_000
+INCREMENTS = 1_000
+FIRST_DAY = date(2000, 1, 1)
+# Every other hour from 06:00 to 20:00; no seeded booking is longer than that, so none overlap.
+STARTS = [clock(hour) for hour in range(6, 22, 2)]
+DURATIONS = [30, 45, 60, 90, 120]
+
+
+def seed(rows):
+    if db.session.scalar(db.select(db.func.count()).select_from(RoomSchedule)) >= rows:
+        return
+    rooms = [room.ID for room in Room.query.all()]
+    per_day = len(rooms) * len(STARTS)
+    for offset in range(0, rows, SEED_BATCH):
+        db.session.execute(db.insert(RoomSchedule), [
+            {'roomId': rooms[number % len(rooms)], 'scheduleDate': FIRST_DAY + timedelta(days=number // per_day),
+             'scheduleTime': STARTS[number // len(rooms) % len(STARTS)],
+             'bookingType': OCCUPANCY_TYPES[number % 7 % len(OCCUPANCY_TYPES)], 'isBooked': True,
+             'durationMinutes': DURATIONS[number % 11 % len(DURATIONS)]}
+            for number in range(offset, min(rows, offset + SEED_BATCH))
+        ])
+        db.session.commit()
+
+
+def python_rebuild(batch_size):
+    deltas = {}
+    result = db.session.execute(db.select(*(getattr(RoomSchedule, name) for name in OCCUPANCY_COLUMNS))
+                                .execution_options(yield_per=batch_size))
+    for row in result:
+        add_occupancy(deltas, *row, 1)
+    return {cell: minutes for cell, minutes in deltas.items() if minutes}
+
+
+def stored_cells():
+    return {(cell.roomId, cell.weekday, cell.hour, cell.bookingType): cell.minutes
+            for cell in db.session.scalars(db.select(RoomOccupancy))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL (default: a throwaway SQLite file)')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='bookings to seed')
+    args = parser.parse_args()
+
+    scratch = None
+    if not args.database:
+        scratch = tempfile.TemporaryDirectory()
+        args.database = f'sqlite:///{os.path.join(scratch.name, "occupancy.db")}'
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database, 'WAITLIST_WORKER': False})
+    try:
+        measure(app, args.rows)
+    finally:
+        if scratch:
+            scratch.cleanup()
+
+
+def measure(app, rows):
+    with app.app_context():
+        initialize_database()
+        began = time.perf_counter()
+        seed(rows)
+        print(f'seeded in {time.perf_counter() - began:.1f} s')
+        total = db.session.scalar(db.select(db.func.count()).select_from(RoomSchedule))
+
+        began = time.perf_counter()
+        cells = rebuild_room_occupancy()
+        vectorized = time.perf_counter() - began
+        began = time.perf_counter()
+        expected = python_rebuild(app.config['EXPORT_BATCH_SIZE'])
+        looped = time.perf_counter() - began
+        assert stored_cells() == expected, 'numpy rebuild and Python loop disagree'
+
+        room = Room.query.first().ID
+        samples = []
+        for number in range(INCREMENTS):
+            deltas = {}
+            add_occupancy(deltas, room, FIRST_DAY + timedelta(days=number), STARTS[number % len(STARTS)],
+                          DURATIONS[number % len(DURATIONS)], OCCUPANCY_TYPES[number % len(OCCUPANCY_TYPES)], 1)
+            began = time.perf_counter()
+            apply_occupancy(db.session.connection(), deltas)
+            samples.append((time.perf_counter() - began) * 1000)
+        db.session.rollback()
+
+    print(f'{total} bookings, {cells} occupancy cells')
+    print(f'  rebuild, SQL GROUP BY + numpy {vectorized:8.2f} s  ({total / vectorized:,.0f} bookings/s)')
+    print(f'  rebuild, Python loop         {looped:8.2f} s  ({total / looped:,.0f} bookings/s)')
+    print(f'  incremental upsert per booking  median {statistics.median(samples):.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
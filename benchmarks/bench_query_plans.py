@@ -0,0 +1,189 @@
+"""Query plans and latencies of the hot access paths before and after the 6f1a9c3e2d58 indexes.
+
+Seeds the configured PostgreSQL database (once), then runs every query twice: with the
+indexes the migration replaced temporarily put back, and with the current schema restored.
+Prints each plan and median latency:
+
+    python benchmarks/bench_query_plans.py [schedules] [members]
+"""
+import os
+import statistics
+import sys
+import time
+from datetime import date, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db, initialize_database, Course, Feedback, Instructors, Phone, Room, RoomSchedule, \
+    Users, User_Course  # noqa: E402
+
+SEED_BATCH = 50_000
+REPEAT = 50
+FIRST_DAY = date(2024, 1, 1)
+MEMBER = 'PLAN-42'
+
+# The migration's new indexes, and the ones it dropped, as (name, table, columns).
+NEW_INDEXES = ['uq_RoomSchedule_slot', 'ix_RoomSchedule_userID_scheduleDate', 'ix_RoomSchedule_scheduleDate',
+               'ix_User_Course_userID_courseName', 'ix_Phone_userSSN_phone', 'ix_Feedback_roomId_feedBackNo',
+               'ix_Feedback_userID_feedBackNo']
+OLD_INDEXES = [('ix_RoomSchedule_roomId_scheduleDate', 'RoomSchedule', ['roomId', 'scheduleDate']),
+               ('ix_RoomSchedule_userID', 'RoomSchedule', ['userID']),
+               ('ix_User_Course_userID', 'User_Course', ['userID']),
+               ('ix_Phone_userSSN', 'Phone', ['userSSN']),
+               ('ix_Feedback_roomId', 'Feedback', ['roomId']),
+               ('ix_Feedback_userID', 'Feedback', ['userID'])]
+
+
+def queries(room):
+    week = (FIRST_DAY + timedelta(days=70), FIRST_DAY + timedelta(days=76))
+    return {
+        'availability: room over a week': db.select(
+            RoomSchedule.scheduleID, RoomSchedule.scheduleDate, RoomSchedule.scheduleTime, RoomSchedule.durationMinutes)
+        .where(RoomSchedule.roomId == room, RoomSchedule.scheduleDate.between(*week)),
+        'slot lookup: room, date, time': db.select(RoomSchedule.scheduleID).where(
+            RoomSchedule.roomId == room, RoomSchedule.scheduleDate == week[0], RoomSchedule.scheduleTime == clock(9)),
+        'member bookings page': db.select(RoomSchedule.scheduleID, Room.roomName, RoomSchedule.scheduleDate,
+                                          RoomSchedule.scheduleTime, RoomSchedule.bookingType)
+        .join(Room, Room.ID == RoomSchedule.roomId).where(RoomSchedule.userID == MEMBER)
+        .order_by(RoomSchedule.scheduleDate, RoomSchedule.scheduleTime),
+        'member enrolled courses': db.select(User_Course.courseName).where(User_Course.userID == MEMBER),
+        'member phones': db.select(Phone.phone).where(Phone.userSSN == MEMBER),
+        'room feedback page': db.select(Feedback).where(Feedback.roomId == room)
+        .order_by(Feedback.feedBackNo).limit(100),
+        'week of schedules (timetable/export)': db.select(
+            RoomSchedule.roomId, RoomSchedule.scheduleDate, RoomSchedule.scheduleTime)
+        .where(RoomSchedule.scheduleDate.between(*week)),
+    }
+
+
+def seed(schedules, members):
+    if Users.query.get('PLAN-0'):
+        return
+    rooms = [room.ID for room in Room.query.all()]
+    db.session.add(Instructors(SSN='PLAN-INS', firstName='Plan', lastName='Coach'))
+    db.session.flush()
+    db.session.add_all(Course(courseName=f'PLAN-{number}', capacity=99, seatsAvailable=99, isSpecial=False,
+                              InstructorID='PLAN-INS', roomId=rooms[number % len(rooms)]) for number in range(50))
+    db.session.commit()
+
+    for offset in range(0, members, SEED_BATCH):
+        numbers = range(offset, min(members, offset + SEED_BATCH))
+        db.session.execute(db.insert(Users), [
+            {'SSN': f'PLAN-{number}', 'firstName': 'Plan', 'lastName': str(number), 'membershipType': 'rm',
+             'password_hash': 'unused'} for number in numbers])
+        db.session.execute(db.insert(Phone), [
+            {'phone': f'P{number}-{line}', 'userSSN': f'PLAN-{number}'} for number in numbers for line in range(2)])
+        db.session.execute(db.insert(User_Course), [
+            {'courseName': f'PLAN-{(number + step) % 50}', 'userID': f'PLAN-{number}'}
+            for number in numbers for step in range(3)])
+        db.session.commit()
+
+    for offset in range(0, schedules, SEED_BATCH):
+        db.session.execute(db.insert(RoomSchedule), [
+            {'roomId': rooms[number % len(rooms)],
+             'scheduleDate': FIRST_DAY + timedelta(days=number // (14 * len(rooms))),
+             'scheduleTime': clock(7 + number // len(rooms) % 14), 'bookingType': 'private', 'isBooked': True,
+             'userID': f'PLAN-{number % members}', 'durationMinutes': 60}
+            for number in range(offset, min(schedules, offset + SEED_BATCH))
+        ])
+        db.session.commit()
+
+    rated = db.session.execute(db.select(RoomSchedule.scheduleID, RoomSchedule.roomId, RoomSchedule.userID)
+                               .where(RoomSchedule.userID.like('PLAN-%')).limit(schedules // 10)).all()
+    for offset in range(0, len(rated), SEED_BATCH):
+        db.session.execute(db.insert(Feedback), [
+            {'roomId': room, 'userID': user, 'scheduleID': schedule_id, 'score': 1 + schedule_id % 5}
+            for schedule_id, room, user in rated[offset:offset + SEED_BATCH]])
+        db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+
+
+def explain(connection, statement):
+    prefix = 'EXPLAIN ANALYZE ' if connection.dialect.name == 'postgresql' else 'EXPLAIN QUERY PLAN '
+
+    # Let SQLAlchemy compile and bind the statement as usual, then run it under EXPLAIN.
+    def prepend(conn, cursor, sql, parameters, context, executemany):
+        return prefix + sql, parameters
+
+    event.listen(connection, 'before_cursor_execute', prepend, retval=True)
+    try:
+        # Read the plan straight from the DBAPI cursor; the statement's own result processors do not apply.
+        result = connection.execute(statement)
+        plan = [row[-1] for row in result.cursor.fetchall()]
+        result.close()
+        return plan
+    finally:
+        event.remove(connection, 'before_cursor_execute', prepend)
+
+
+def use_old_indexes(connection):
+    for name in NEW_INDEXES:
+        connection.exec_driver_sql(f'DROP INDEX "{name}"')
+    for name, table, columns in OLD_INDEXES:
+        quoted = ', '.join(f'"{column}"' for column in columns)
+        connection.exec_driver_sql(f'CREATE INDEX "{name}" ON "{table}" ({quoted})')
+    connection.exec_driver_sql('ANALYZE')
+
+
+def restore_indexes(connection):
+    for name, _, _ in OLD_INDEXES:
+        connection.exec_driver_sql(f'DROP INDEX "{name}"')
+    for model in (RoomSchedule, User_Course, Phone, Feedback):
+        for index in model.__table__.indexes:
+            if index.name in NEW_INDEXES:
+                index.create(connection)
+    connection.exec_driver_sql('ANALYZE')
+
+
+def measure(connection, statement):
+    samples = []
+    for _ in range(REPEAT):
+        began = time.perf_counter()
+        connection.execute(statement).all()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def run(connection, room):
+    return {name: (explain(connection, statement), measure(connection, statement))
+            for name, statement in queries(room).items()}
+
+
+def main():
+    schedules = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    app = create_app()
+
+    with app.app_context():
+        initialize_database()
+        seed(schedules, members)
+        room = Room.query.first().ID
+
+        db.session.close()
+
+        with db.engine.begin() as connection:
+            use_old_indexes(connection)
+        try:
+            with db.engine.connect() as connection:
+                before = run(connection, room)
+        finally:
+            with db.engine.begin() as connection:
+                restore_indexes(connection)
+        with db.engine.connect() as connection:
+            after = run(connection, room)
+
+    for name in before:
+        print(f'== {name}: {before[name][1]:.3f} ms -> {after[name][1]:.3f} ms')
+        print('  before:')
+        for line in before[name][0]:
+            print(f'    {line}')
+        print('  after:')
+        for line in after[name][0]:
+            print(f'    {line}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""The sync Flask views against the async read service, same reads, same database, same load.
+
+Seeds the database like load_test.py, then starts the documented gunicorn target (one
+worker, GYM_THREADS threads) and the read service (one uvicorn worker) as separate
+processes. Checks that both return the same bodies, then drives each endpoint at
+increasing concurrency from an asyncio client:
+
+    python benchmarks/bench_read_service.py [--database URL] [--concurrency 16,64,256] [--seconds 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import app as gym  # noqa: E402
+from load_test import MEMBER, MEMBER_PASSWORD, percentile, seed  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def wait_for(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f'server exited with {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    sys.exit(f'nothing listening on {port}')
+
+
+async def get(port, path, headers):
+    """One GET on a fresh connection; returns (status, headers, body)."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    extra = ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n{extra}\r\n'.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    fields = dict(line.split(': ', 1) for line in lines[1:])
+    if fields.get('Transfer-Encoding') == 'chunked':
+        body = dechunk(body)
+    return int(lines[0].split()[1]), fields, body
+
+
+def dechunk(body):
+    data = b''
+    while body:
+        size, _, body = body.partition(b'\r\n')
+        size = int(size, 16)
+        if not size:
+            break
+        data, body = data + body[:size], body[size + 2:]
+    return data
+
+
+async def drive(port, path, headers, concurrency, seconds):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        while time.perf_counter() < deadline:
+            began = time.perf_counter()
+            try:
+                status = (await get(port, path, headers))[0]
+            except OSError:
+                status = 599
+            latencies.append((time.perf_counter() - began) * 1000)
+            if status >= 400:
+                errors.append(status)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {'rps': len(latencies) / elapsed, 'p50': percentile(latencies, 0.50),
+            'p99': percentile(latencies, 0.99), 'errors': len(errors)}
+
+
+async def token(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps({'SSN': MEMBER, 'password': MEMBER_PASSWORD}).encode()
+    writer.write(b'POST /api/v1/auth/login HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n'
+                 b'Content-Type: application/json\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.partition(b'\r\n\r\n')[2])['token']
+
+
+async def compare(args, servers, endpoints):
+    bearer = {'Authorization': f'Bearer {await token(servers["sync"])}'}
+    for path, private in endpoints:
+        headers = bearer if private else {}
+        answers = [await get(servers[name], path, headers) for name in ('sync', 'async')]
+        (sync_status, sync_headers, sync_body), (async_status, async_headers, async_body) = answers
+        same = sync_status == async_status == 200 and json.loads(sync_body) == json.loads(async_body) \
+            and sync_headers.get('X-Next-Cursor') == async_headers.get('x-next-cursor')
+        assert same, f'{path}: sync {sync_status} and async {async_status} answers differ'
+
+    print(f'{"endpoint":<18} {"clients":>7}   {"sync req/s":>10} {"p50 ms":>8} {"p99 ms":>8} {"err":>5}'
+          f'   {"async req/s":>11} {"p50 ms":>8} {"p99 ms":>8} {"err":>5}')
+    for path, private in endpoints:
+        for concurrency in args.concurrency:
+            results = [await drive(servers[name], path, bearer if private else {}, concurrency, args.seconds)
+                       for name in ('sync', 'async')]
+            print(f'{path.split("?")[0][7:]:<18} {concurrency:>7}' + ''.join(
+                f'   {result["rps"]:>10.1f} {result["p50"]:>8.1f} {result["p99"]:>8.1f} {result["errors"]:>5}'
+                for result in results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL (default: a throwaway SQLite file)')
+    parser.add_argument('--scale', type=int, default=1, help='multiplier for the seeded data volume')
+    parser.add_argument('--concurrency', type=lambda value: [int(item) for item in value.split(',')],
+                        default=[16, 64, 256], help='comma separated client counts')
+    parser.add_argument('--seconds', type=float, default=5, help='duration of each run')
+    parser.add_argument('--threads', type=int, default=8, help='threads of the gunicorn worker')
+    args = parser.parse_args()
+
+    scratch = None
+    if not args.database:
+        scratch = tempfile.TemporaryDirectory()
+        args.database = f'sqlite:///{os.path.join(scratch.name, "read_service.db")}'
+
+    app = gym.create_app({'SQLALCHEMY_DATABASE_URI': args.database})
+    with app.app_context():
+        gym.initialize_database()
+        seed(gym, args.scale)
+        gym.db.engine.dispose()
+
+    today = date.today()
+    week = f'dateFrom={today.isoformat()}&dateTo={(today + timedelta(days=6)).isoformat()}'
+    endpoints = [('/api/v1/courses?limit=50', False), ('/api/v1/rooms', False),
+                 (f'/api/v1/availability?{week}', False), (f'/api/v1/bookings?limit=50&{week}', True)]
+
+    servers = {'sync': free_port(), 'async': free_port()}
+    env = {**os.environ, 'FLASK_SQLALCHEMY_DATABASE_URI': args.database, 'GYM_WORKERS': '1',
+           'GYM_THREADS': str(args.threads), 'GYM_BIND': f'127.0.0.1:{servers["sync"]}'}
+    processes = [
+        subprocess.Popen(['gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'], cwd=ROOT, env=env),
+        subprocess.Popen([sys.executable, '-m', 'uvicorn', '--factory', 'read_service:create_read_service',
+                          '--port', str(servers['async']), '--log-level', 'warning', '--no-access-log'],
+                         cwd=ROOT, env=env),
+    ]
+    try:
+        for port, process in zip(servers.values(), processes):
+            wait_for(port, process)
+        asyncio.run(compare(args, servers, endpoints))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+        if scratch:
+            scratch.cleanup()
+
+
+if __name__ == '__main__':
+    main()
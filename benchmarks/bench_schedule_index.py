@@ -0,0 +1,60 @@
+"""Conflict-check latency of RoomScheduleIndex with 1M schedule rows loaded.
+
+    python benchmarks/bench_schedule_index.py [rows]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import RoomScheduleIndex  # noqa: E402
+
+ROOMS = 50
+SLOTS_PER_DAY = 28  # 30 minute bookings from 07:00 to 21:00
+
+
+def synthetic_rows(count):
+    first_day = date(2024, 1, 1)
+    for schedule_id in range(count):
+        slot = schedule_id % SLOTS_PER_DAY
+        room = (schedule_id // SLOTS_PER_DAY) % ROOMS
+        day = first_day + timedelta(days=schedule_id // (SLOTS_PER_DAY * ROOMS))
+        start = 7 * 60 + slot * 30
+        yield schedule_id, room, day, start, start + 30
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    days = max(1, count // (SLOTS_PER_DAY * ROOMS))
+    index = RoomScheduleIndex(ttl=float('inf'))
+
+    started = time.perf_counter()
+    index.load_rows(synthetic_rows(count))
+    print(f'loaded {count} rows into {len(index._buckets)} room-days in {time.perf_counter() - started:.2f}s')
+
+    rng = random.Random(42)
+    samples = []
+    conflicts = 0
+    for _ in range(100_000):
+        room = rng.randrange(ROOMS)
+        day = date(2024, 1, 1) + timedelta(days=rng.randrange(days))
+        start = rng.randrange(6 * 60, 22 * 60, 15)
+        began = time.perf_counter_ns()
+        conflicts += index.find_overlap(room, day, start, start + 60) is not None
+        samples.append(time.perf_counter_ns() - began)
+
+    samples.sort()
+    print(f'checks: {len(samples)}  conflicts: {conflicts}')
+    print(f'p50 {percentile(samples, 0.50) / 1000:.2f}us  p99 {percentile(samples, 0.99) / 1000:.2f}us  '
+          f'max {samples[-1] / 1000:.2f}us')
+
+
+if __name__ == '__main__':
+    main()
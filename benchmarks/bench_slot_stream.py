@@ -0,0 +1,141 @@
+"""Fan-out of live availability changes to thousands of idle server-sent event streams.
+
+Starts the read service (one uvicorn worker) on the configured database, opens
+``streams`` availability streams on the same room and day, then commits one booking
+at a time through the ORM and measures how long each slot-taken event takes to reach
+every stream. Also reports the service's memory per open stream:
+
+    python benchmarks/bench_slot_stream.py [--database URL] [--streams 2000] [--bookings 20] [--poll 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, time as clock, timedelta
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+import app as gym  # noqa: E402
+from bench_read_service import free_port, wait_for  # noqa: E402
+from load_test import percentile  # noqa: E402
+
+ROOM = 1
+DAY = date.today() + timedelta(days=1)
+
+
+def rss_kb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        return next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+
+
+async def open_stream(port, ready, received):
+    """Read one stream; record when each slot-taken event for ROOM arrives."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    query = f'rooms={ROOM}&dateFrom={DAY.isoformat()}&dateTo={DAY.isoformat()}&slotMinutes=60'
+    writer.write(f'GET /api/v1/availability/stream?{query} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode())
+    await writer.drain()
+    name = None
+    try:
+        while True:
+            line = (await reader.readline()).decode()
+            if not line:
+                return
+            if line.startswith('event: '):
+                name = line[len('event: '):].strip()
+            elif line.startswith('data: '):
+                if name == 'availability':
+                    ready.release()
+                elif name == 'slot-taken':
+                    arrived = time.perf_counter()
+                    for slot in json.loads(line[len('data: '):])['slots']:
+                        received.setdefault(slot, []).append(arrived)
+    finally:
+        writer.close()
+
+
+def book(app, hour):
+    with app.app_context():
+        gym.db.session.add(gym.RoomSchedule(roomId=ROOM, scheduleDate=DAY, scheduleTime=clock(hour),
+                                            bookingType='private', userID='ADMIN123', isBooked=True,
+                                            durationMinutes=60))
+        gym.db.session.commit()
+    return time.perf_counter()
+
+
+async def run(app, args, port, service):
+    baseline = rss_kb(service.pid)
+    ready = asyncio.Semaphore(0)
+    received = {}
+    began = time.perf_counter()
+    readers = [asyncio.create_task(open_stream(port, ready, received)) for _ in range(args.streams)]
+    for _ in range(args.streams):
+        await ready.acquire()
+    opened = time.perf_counter() - began
+    await asyncio.sleep(1)
+    memory = rss_kb(service.pid) - baseline
+
+    latencies = []
+    for number in range(args.bookings):
+        slot = f'{number % 24:02d}:00'
+        committed = await asyncio.to_thread(book, app, number % 24)
+        while len(received.get(slot, ())) < args.streams:
+            await asyncio.sleep(0.01)
+        latencies.extend((arrived - committed) * 1000 for arrived in received[slot])
+    for task in readers:
+        task.cancel()
+
+    latencies.sort()
+    print(f'{args.streams} streams opened in {opened:.2f} s, {memory / args.streams:.1f} KiB of service memory each')
+    print(f'{args.bookings} bookings, poll interval {args.poll} s: commit -> event on every stream'
+          f'  p50 {percentile(latencies, 0.50):.0f} ms  p99 {percentile(latencies, 0.99):.0f} ms'
+          f'  max {latencies[-1]:.0f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL (default: a throwaway SQLite file)')
+    parser.add_argument('--streams', type=int, default=2000, help='open availability streams')
+    parser.add_argument('--bookings', type=int, default=20, help='bookings to commit, one hour each (at most 24)')
+    parser.add_argument('--poll', type=float, default=0.2, help='SLOT_STREAM_POLL_INTERVAL of the service')
+    args = parser.parse_args()
+    args.bookings = min(args.bookings, 24)
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, min(hard, 2 * args.streams + 1024)), hard))
+
+    scratch = None
+    if not args.database:
+        scratch = tempfile.TemporaryDirectory()
+        args.database = f'sqlite:///{os.path.join(scratch.name, "slot_stream.db")}'
+
+    app = gym.create_app({'SQLALCHEMY_DATABASE_URI': args.database, 'WAITLIST_WORKER': False})
+    with app.app_context():
+        gym.initialize_database()
+        gym.db.session.execute(gym.db.delete(gym.RoomSchedule).where(
+            gym.RoomSchedule.roomId == ROOM, gym.RoomSchedule.scheduleDate == DAY))
+        gym.db.session.commit()
+
+    port = free_port()
+    env = {**os.environ, 'FLASK_SQLALCHEMY_DATABASE_URI': args.database,
+           'FLASK_SLOT_STREAM_POLL_INTERVAL': str(args.poll)}
+    service = subprocess.Popen([sys.executable, '-m', 'uvicorn', '--factory', 'read_service:create_read_service',
+                                '--port', str(port), '--log-level', 'warning', '--no-access-log',
+                                '--timeout-graceful-shutdown', '1'], cwd=ROOT, env=env)
+    try:
+        wait_for(port, service)
+        asyncio.run(run(app, args, port, service))
+    finally:
+        service.terminate()
+        service.wait()
+        if scratch:
+            scratch.cleanup()
+
+
+if __name__ == '__main__':
+    main()
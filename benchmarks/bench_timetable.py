@@ -0,0 +1,64 @@
+"""Timetable generator run time on synthetic gyms of increasing size.
+
+    python benchmarks/bench_timetable.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from timetable import Demand, TimetableSolver, free_masks  # noqa: E402
+
+GRANULARITY = 15
+OPENING = (7 * 60, 22 * 60)
+DAYS = range(7)
+SIZES = [(5, 10, 25), (10, 25, 100), (20, 50, 250), (40, 100, 500), (80, 200, 1000)]
+
+
+def synthetic_gym(rooms, instructors, courses, rng):
+    room_free = {room: free_masks({day: [OPENING] for day in DAYS}, {}, DAYS, GRANULARITY) for room in range(rooms)}
+    instructor_free = {}
+    for instructor in range(instructors):
+        working = rng.sample(list(DAYS), 5)
+        shift_start = rng.choice([7, 9, 12, 14]) * 60
+        instructor_free[instructor] = free_masks(
+            {day: [(shift_start, shift_start + 8 * 60)] for day in working}, {}, DAYS, GRANULARITY)
+    demands = [
+        Demand(f'course-{number}', rng.randrange(instructors), rng.sample(range(rooms), min(rooms, 2)),
+               rng.randint(2, 4), rng.choice([45, 60, 60, 90]))
+        for number in range(courses)
+    ]
+    return room_free, instructor_free, demands
+
+
+def assert_conflict_free(placements, gap):
+    by_room, by_instructor = {}, {}
+    for placement in placements:
+        by_room.setdefault((placement.room, placement.day), []).append((placement.start, placement.end + gap))
+        by_instructor.setdefault((placement.instructor, placement.day), []).append((placement.start, placement.end))
+    for intervals in list(by_room.values()) + list(by_instructor.values()):
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            assert start >= end, 'double booking in generated timetable'
+
+
+def main():
+    rng = random.Random(7)
+    print(f'{"rooms":>6} {"instr":>6} {"courses":>8} {"sessions":>9} {"placed":>7} {"unplaced":>9} '
+          f'{"backtracks":>11} {"seconds":>8}')
+    for rooms, instructors, courses in SIZES:
+        room_free, instructor_free, demands = synthetic_gym(rooms, instructors, courses, rng)
+        solver = TimetableSolver(room_free, instructor_free, DAYS, GRANULARITY, cleaning_gap=15)
+        started = time.perf_counter()
+        placements, unplaced = solver.solve(demands)
+        elapsed = time.perf_counter() - started
+        assert_conflict_free(placements, 15)
+        sessions = sum(demand.sessions for demand in demands)
+        print(f'{rooms:>6} {instructors:>6} {courses:>8} {sessions:>9} {len(placements):>7} {len(unplaced):>9} '
+              f'{solver.backtracks:>11} {elapsed:>8.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Cost of promoting one waitlisted member as the queue grows.
+
+Fills a one-seat course, queues ``length`` members with mixed membership tiers, then
+frees seats one at a time and times ``WaitlistPromoter.promote`` for each, counting
+the statements it runs. Time and statements per seat should not grow with the queue:
+
+    python benchmarks/bench_waitlist.py [lengths...]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db, initialize_database, release_course_seat, waitlist_priority, \
+    waitlist_promoter, Course, Instructors, Room, Users, User_Course, Waitlist  # noqa: E402
+
+SEED_BATCH = 50_000
+PROMOTIONS = 200
+TIERS = ('em', 'rm', 'am')
+
+
+def seed(course_name, length):
+    room = Room.query.first().ID
+    if not Instructors.query.get('WAIT-INS'):
+        db.session.add(Instructors(SSN='WAIT-INS', firstName='Wait', lastName='Coach'))
+        db.session.flush()
+    db.session.add(Course(courseName=course_name, capacity=1, seatsAvailable=0, isSpecial=False,
+                          InstructorID='WAIT-INS', roomId=room))
+    db.session.commit()
+    for offset in range(0, length, SEED_BATCH):
+        numbers = range(offset, min(length, offset + SEED_BATCH))
+        db.session.execute(db.insert(Users), [
+            {'SSN': f'{course_name}-{number}', 'firstName': 'Wait', 'lastName': str(number),
+             'membershipType': TIERS[number % len(TIERS)], 'password_hash': 'unused'} for number in numbers])
+        db.session.execute(db.insert(Waitlist), [
+            {'courseName': course_name, 'userID': f'{course_name}-{number}',
+             'priority': waitlist_priority(TIERS[number % len(TIERS)])} for number in numbers])
+        db.session.commit()
+
+
+def measure(course_name):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    samples = []
+    counts = []
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(PROMOTIONS):
+            release_course_seat(course_name)
+            db.session.commit()
+            del statements[:]
+            began = time.perf_counter()
+            promoted = waitlist_promoter.promote(course_name)
+            samples.append((time.perf_counter() - began) * 1000)
+            counts.append(len(statements))
+            assert promoted == 1, promoted
+            # Empty the seat again without releasing it, so the next round starts full.
+            db.session.execute(db.delete(User_Course).where(User_Course.courseName == course_name))
+            db.session.commit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return statistics.median(samples), max(counts)
+
+
+def main():
+    lengths = [int(value) for value in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    app = create_app({'WAITLIST_WORKER': False, 'SLOW_QUERY_MS': 0})
+
+    with app.app_context():
+        initialize_database()
+        print(f'{"queue length":>12}  {"median ms/seat":>14}  {"statements/seat":>15}')
+        for length in lengths:
+            course_name = f'WAIT-{length}'
+            if not Course.query.get(course_name):
+                seed(course_name, length)
+            median, statements = measure(course_name)
+            print(f'{length:>12}  {median:>14.3f}  {statements:>15}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Run bulk writes through the API with the N+1 detector raising, as it does under TESTING.
+
+One executemany or insertmanyvalues call is one statement however many rows it
+carries, and a member's seats are released in one statement however many courses
+they took, so requests that write many rows in one call must pass while a statement
+issued in a loop still trips the detector. Runs against a throwaway SQLite file (or
+the database passed as --database):
+
+    python benchmarks/check_repeated_queries.py [--database URL]
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db, initialize_database, Course, Instructors, RepeatedQueryError, Room, \
+    User_Course, Users  # noqa: E402
+
+FIRST_DAY = date(2035, 1, 1)
+MEMBER = 'REPEATQ-MEMBER'
+
+
+def check_recurrence(client, headers, limit):
+    room = db.session.scalar(db.select(Room.ID).order_by(Room.ID))
+    days = 7 * (limit + 5)
+    response = client.post('/api/v1/recurrences', headers=headers, json={
+        'roomId': room, 'bookingType': 'private', 'userID': 'ADMIN123', 'weekdays': ['mon'],
+        'startTime': '06:00', 'durationMinutes': 30, 'startDate': FIRST_DAY.isoformat(),
+        'endDate': (FIRST_DAY + timedelta(days=days - 1)).isoformat()})
+    assert response.status_code == 201, f'recurrence returned {response.status_code}: {response.get_json()}'
+    occurrences = response.get_json()['occurrences']
+    assert occurrences > limit, f'only {occurrences} occurrences, need more than {limit}'
+    client.delete(f"/api/v1/recurrences/{response.get_json()['recurrenceIDs'][0]}", headers=headers)
+    return f'recurrence with {occurrences} occurrences'
+
+
+def check_user_delete(client, headers, limit):
+    room = db.session.scalar(db.select(Room.ID).order_by(Room.ID))
+    courses = [f'REPEATQ-{number}' for number in range(limit + 2)]
+    member = Users(SSN=MEMBER, firstName='Repeated', lastName='Queries', membershipType='rm')
+    member.password_hash = 'unused'
+    db.session.add_all([member, Instructors(SSN=MEMBER, firstName='Repeated', lastName='Coach')])
+    db.session.flush()
+    db.session.add_all(Course(courseName=name, capacity=20, seatsAvailable=19, isSpecial=False,
+                              InstructorID=MEMBER, roomId=room) for name in courses)
+    db.session.flush()
+    db.session.add_all(User_Course(courseName=name, userID=MEMBER) for name in courses)
+    db.session.commit()
+
+    response = client.delete(f'/api/v1/users/{MEMBER}', headers=headers)
+    assert response.status_code == 200, f'user delete returned {response.status_code}: {response.get_json()}'
+    seats = db.session.scalars(db.select(Course.seatsAvailable).where(Course.courseName.in_(courses))).all()
+    assert seats == [20] * len(courses), f'seats after the delete: {seats}'
+    Course.query.filter(Course.courseName.in_(courses)).delete(synchronize_session=False)
+    Instructors.query.filter_by(SSN=MEMBER).delete(synchronize_session=False)
+    db.session.commit()
+    return f'deleting a member with {len(courses)} enrollments'
+
+
+def check_loop_detected(app, limit):
+    with app.test_request_context('/'):
+        app.preprocess_request()
+        try:
+            for _ in range(limit + 1):
+                db.session.get(Users, 'ADMIN123', populate_existing=True)
+        except RepeatedQueryError:
+            return f'{limit + 1} lookups in a loop raise RepeatedQueryError'
+    raise AssertionError(f'{limit + 1} identical lookups in one request were not flagged')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL (default: a throwaway SQLite file)')
+    args = parser.parse_args()
+
+    scratch = None
+    if not args.database:
+        scratch = tempfile.TemporaryDirectory()
+        args.database = f'sqlite:///{os.path.join(scratch.name, "repeated_queries.db")}'
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database, 'TESTING': True, 'WAITLIST_WORKER': False,
+                   'PASSWORD_HASH_WORKERS': 0})
+    limit = app.config['REPEATED_QUERY_LIMIT']
+    try:
+        with app.app_context():
+            initialize_database()
+            client = app.test_client()
+            token = client.post('/api/v1/auth/login', json={'SSN': 'ADMIN123', 'password': 'admin123'}).get_json()
+            headers = {'Authorization': f"Bearer {token['token']}"}
+            print('ok  ', check_recurrence(client, headers, limit))
+            print('ok  ', check_user_delete(client, headers, limit))
+        print('ok  ', check_loop_detected(app, limit))
+    finally:
+        if scratch:
+            scratch.cleanup()
+    print('OK: bulk writes pass the N+1 detector and loops still trip it')
+
+
+if __name__ == '__main__':
+    main()
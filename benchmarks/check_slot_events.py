@@ -0,0 +1,82 @@
+"""Replay slot events out of order through the read service's SlotFeed and one stream.
+
+A booking's 'taken' event can commit after a later event ID was already polled, and
+arrive through the gap refetch after its own 'freed' event. Writes such sequences into
+a scratch SQLite database, polls them the way the read service does, and fails unless
+the stream ends with the slots the newest event of each booking says:
+
+    python benchmarks/check_slot_events.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from app import SlotEvent  # noqa: E402
+from read_service import SlotFeed, slot_masks  # noqa: E402
+
+ROOM = 1
+DAY = date(2030, 1, 7)
+SLOTS = slot_masks(60)
+
+# (name, [batches of (eventID, kind, scheduleID, startMinute)], slots occupied at the end).
+# Each batch commits before the next poll; IDs missing from a batch are still in flight.
+CASES = [
+    ('in order', [[(1, 'taken', 7, 540)], [(2, 'freed', 7, 540)]], []),
+    ('taken through the gap after freed', [[(2, 'freed', 7, 540)], [(1, 'taken', 7, 540)]], []),
+    ('moved, old slot through the gap', [[(2, 'freed', 7, 540), (3, 'taken', 7, 600)], [(1, 'taken', 7, 540)]],
+     ['10:00']),
+    ('taken again after the gap', [[(2, 'freed', 7, 540)], [(1, 'taken', 7, 540)], [(3, 'taken', 7, 660)]],
+     ['11:00']),
+]
+
+
+async def replay(engine, batches):
+    async with engine.begin() as connection:
+        await connection.run_sync(SlotEvent.__table__.drop, checkfirst=True)
+        await connection.run_sync(SlotEvent.__table__.create)
+    feed = SlotFeed(engine, 0, 1000)
+    await feed.poll()
+    stream = feed.subscribe([ROOM], DAY, DAY)
+    for batch in batches:
+        async with engine.begin() as connection:
+            await connection.execute(insert(SlotEvent), [
+                {'eventID': event_id, 'kind': kind, 'scheduleID': schedule_id, 'roomId': ROOM, 'scheduleDate': DAY,
+                 'startMinute': start, 'endMinute': start + 60, 'createdAt': datetime.utcnow()}
+                for event_id, kind, schedule_id, start in batch])
+        await feed.poll()
+        while not stream.queue.empty():
+            stream.apply(stream.queue.get_nowait(), SLOTS)
+    intervals = stream.bookings.get((ROOM, DAY), {}).values()
+    return [f'{start // 60:02d}:{start % 60:02d}' for start, end in sorted(intervals)]
+
+
+async def run(path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    failures = 0
+    try:
+        for name, batches, expected in CASES:
+            occupied = await replay(engine, batches)
+            failures += occupied != expected
+            print(f"{'ok  ' if occupied == expected else 'FAIL'} {name}: occupied {occupied}, expected {expected}")
+    finally:
+        await engine.dispose()
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as scratch:
+        failures = asyncio.run(run(os.path.join(scratch, 'slot_events.db')))
+    if failures:
+        sys.exit(f'{failures} case(s) left the stream with the wrong slots')
+    print('OK: every stream matches the newest event per booking')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Count the SQL statements each server-rendered page issues at two data sizes.
+
+Every admin and member page must run a constant number of queries, however many
+rows it renders. Seeds a small and a large data set into the configured database
+and fails if any page's query count grows with the row count:
+
+    python benchmarks/check_view_queries.py [small] [large]
+"""
+import os
+import sys
+from datetime import date, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db, initialize_database, Course, Instructors, Phone, Room, RoomSchedule, Users, \
+    User_Course  # noqa: E402
+
+MEMBER = 'VIEWQ-MEMBER'
+PAGES = ['/admin/courses', '/admin/schedules', '/admin/users', '/admin/rooms',
+         '/member/dashboard', '/member/courses', '/member/bookings', '/member/profile']
+
+
+def reset():
+    RoomSchedule.query.filter(RoomSchedule.courseName.like('VIEWQ-%')).delete(synchronize_session=False)
+    RoomSchedule.query.filter_by(userID=MEMBER).delete(synchronize_session=False)
+    User_Course.query.filter(User_Course.courseName.like('VIEWQ-%')).delete(synchronize_session=False)
+    Course.query.filter(Course.courseName.like('VIEWQ-%')).delete(synchronize_session=False)
+    Instructors.query.filter(Instructors.SSN.like('VIEWQ-%')).delete(synchronize_session=False)
+    Phone.query.filter_by(userSSN=MEMBER).delete(synchronize_session=False)
+    Users.query.filter_by(SSN=MEMBER).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def seed(rows):
+    reset()
+    rooms = [room.ID for room in Room.query.all()]
+    member = Users(SSN=MEMBER, firstName='View', lastName='Queries', membershipType='rm')
+    member.password_hash = 'unused'
+    db.session.add(member)
+    db.session.add_all(Phone(phone=f'VQ{number}', userSSN=MEMBER) for number in range(min(rows, 5)))
+    db.session.add_all(Instructors(SSN=f'VIEWQ-{number}', firstName='Coach', lastName=str(number))
+                       for number in range(rows))
+    db.session.flush()
+    db.session.add_all(Course(courseName=f'VIEWQ-{number}', capacity=20, seatsAvailable=19, isSpecial=False,
+                              InstructorID=f'VIEWQ-{number}', roomId=rooms[number % len(rooms)])
+                       for number in range(rows))
+    db.session.flush()
+    db.session.add_all(User_Course(courseName=f'VIEWQ-{number}', userID=MEMBER) for number in range(rows))
+    db.session.execute(db.insert(RoomSchedule), [
+        {'roomId': rooms[number % len(rooms)], 'scheduleDate': date(2031, 1, 1) + timedelta(days=number),
+         'scheduleTime': clock(9), 'bookingType': 'class', 'userID': MEMBER, 'courseName': f'VIEWQ-{number}',
+         'isBooked': True, 'durationMinutes': 60}
+        for number in range(rows)
+    ])
+    db.session.commit()
+
+
+def count_queries(app, client):
+    counts = {}
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        for page in PAGES:
+            statements.clear()
+            response = client.get(page)
+            assert response.status_code == 200, f'{page} returned {response.status_code}'
+            counts[page] = len(statements)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    return counts
+
+
+def main():
+    small = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    large = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    app = create_app()
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        # Admin pages only check the session's user type and member pages read user_ssn.
+        session['user_token'] = 'view-queries'
+        session['user_type'] = 'ad'
+        session['user_ssn'] = MEMBER
+
+    results = {}
+    for rows in (small, large):
+        with app.app_context():
+            initialize_database()
+            seed(rows)
+        results[rows] = count_queries(app, client)
+
+    with app.app_context():
+        reset()
+
+    print(f'{"page":<20} {small:>8} rows {large:>8} rows')
+    for page in PAGES:
+        print(f'{page:<20} {results[small][page]:>8}      {results[large][page]:>8}')
+    grew = [page for page in PAGES if results[large][page] > results[small][page]]
+    assert not grew, f'query count grows with rows on: {", ".join(grew)}'
+    print("OK: no page's query count grows with its row count")
+
+
+if __name__ == '__main__':
+    main()
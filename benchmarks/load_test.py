@@ -0,0 +1,412 @@
+"""Load test every /api/v1 resource and the admin/member pages with concurrent clients.
+
+Boots the app on a threaded in-process server against a throwaway SQLite file (or the
+database passed as --database), seeds a gym of realistic size, then runs each scenario
+with --clients concurrent clients for --seconds. Write scenarios (bookings, enrollments,
+recurrences, timetables, feedback, waitlists) build a fresh request from a per-scenario
+counter, so every request writes a new row instead of hitting a conflict. Writes a
+JSON report with p50/p95/p99
+latency, throughput and SQL statements per request; pass an earlier report as
+--baseline to compare two commits:
+
+    python benchmarks/load_test.py --report before.json
+    python benchmarks/load_test.py --baseline before.json --report after.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date, time as clock, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+import app as gym  # noqa: E402
+
+SEED_BATCH = 20_000
+MEMBER = 'LOAD-MEMBER'
+MEMBER_PASSWORD = 'load-member'
+# Courses for the enrollment and waitlist scenarios: open ones with seats for everybody, full ones.
+WRITE_COURSES = 20
+OPEN_CAPACITY = 1_000_000
+# First day of each write scenario's own date range, in days after today, clear of the seeded bookings.
+BOOKING_DAYS, RECURRENCE_DAYS, TIMETABLE_DAYS = 1000, 3000, 6000
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def seed(gym, scale):
+    """Bulk insert members, courses, bookings, enrollments and feedback; returns the seeded sizes."""
+    db = gym.db
+    sizes = {'members': 2000 * scale, 'instructors': 20 * scale, 'courses': 60 * scale,
+             'schedules': 50_000 * scale, 'enrollments': 3 * 2000 * scale, 'feedbacks': 5000 * scale}
+    if gym.Users.query.get(MEMBER):
+        return sizes
+
+    rooms = [room.ID for room in gym.Room.query.order_by(gym.Room.ID)]
+    members = [f'LOAD-{number}' for number in range(sizes['members'])]
+    courses = [f'LOAD-{number}' for number in range(sizes['courses'])]
+    member = gym.Users(SSN=MEMBER, firstName='Load', lastName='Member', membershipType='rm')
+    member.set_password(MEMBER_PASSWORD)
+    db.session.add(member)
+    db.session.execute(db.insert(gym.Instructors), [
+        {'SSN': f'LOAD-INS-{number}', 'firstName': 'Coach', 'lastName': str(number)}
+        for number in range(sizes['instructors'])])
+    db.session.execute(db.insert(gym.Course), [
+        {'courseName': name, 'capacity': 99, 'seatsAvailable': 96, 'isSpecial': number % 10 == 0,
+         'InstructorID': f'LOAD-INS-{number % sizes["instructors"]}', 'roomId': rooms[number % len(rooms)]}
+        for number, name in enumerate(courses)])
+    db.session.execute(db.insert(gym.Course), [
+        {'courseName': f'LOAD-{kind}-{number}', 'capacity': capacity, 'seatsAvailable': capacity,
+         'isSpecial': False, 'InstructorID': 'LOAD-INS-0', 'roomId': rooms[0]}
+        for kind, capacity in (('OPEN', OPEN_CAPACITY), ('FULL', 0)) for number in range(WRITE_COURSES)])
+    db.session.execute(db.insert(gym.Users), [
+        {'SSN': ssn, 'firstName': 'Load', 'lastName': ssn, 'membershipType': ('em', 'rm', 'am')[number % 3],
+         'password_hash': 'unused'} for number, ssn in enumerate(members)])
+    db.session.execute(db.insert(gym.Phone), [
+        {'phone': f'P-{ssn}-{line}', 'userSSN': ssn} for ssn in members for line in range(2)])
+    db.session.execute(db.insert(gym.User_Course), [
+        {'courseName': courses[(number + step) % len(courses)], 'userID': ssn}
+        for number, ssn in enumerate(members + [MEMBER]) for step in range(3)])
+    db.session.commit()
+
+    # Fourteen hourly slots per room and day, centred on today so date windows hit data.
+    first_day = date.today() - timedelta(days=sizes['schedules'] // (28 * len(rooms)))
+    for offset in range(0, sizes['schedules'], SEED_BATCH):
+        rows = []
+        for number in range(offset, min(sizes['schedules'], offset + SEED_BATCH)):
+            private = number % 4 == 0
+            rows.append({'roomId': rooms[number % len(rooms)],
+                         'scheduleDate': first_day + timedelta(days=number // (14 * len(rooms))),
+                         'scheduleTime': clock(7 + number // len(rooms) % 14),
+                         'bookingType': 'private' if private else 'class', 'isBooked': True,
+                         'userID': (members + [MEMBER])[number % (len(members) + 1)] if private else None,
+                         'courseName': None if private else courses[number % len(courses)],
+                         'durationMinutes': 60})
+        db.session.execute(db.insert(gym.RoomSchedule), rows)
+        db.session.commit()
+
+    rated = db.session.execute(
+        db.select(gym.RoomSchedule.scheduleID, gym.RoomSchedule.roomId).limit(sizes['feedbacks'])).all()
+    db.session.execute(db.insert(gym.Feedback), [
+        {'roomId': room, 'userID': members[schedule_id % len(members)], 'scheduleID': schedule_id,
+         'score': 1 + schedule_id % 5, 'comment': 'seeded'} for schedule_id, room in rated])
+    db.session.commit()
+
+    gym.rebuild_rating_summaries()
+    gym.reference_cache.invalidate(['Instructors', 'Course'])
+    return sizes
+
+
+def slot(rooms, first_day, number, days=1):
+    """The number-th distinct (roomId, day, hour) of fourteen hourly slots per room, ``days`` days apart."""
+    per_day = 14 * len(rooms)
+    return (rooms[number % len(rooms)], first_day + timedelta(days=number // per_day * days),
+            f'{7 + number // len(rooms) % 14:02d}:00')
+
+
+def write_scenarios(gym, members):
+    """(name, method, path, credentials, body) whose body is built from a per-scenario request number."""
+    db = gym.db
+    today = date.today()
+    rooms = [room for room, in db.session.execute(db.select(gym.Room.ID).order_by(gym.Room.ID))]
+    schedules = db.session.scalars(db.select(gym.RoomSchedule.scheduleID)
+                                   .order_by(gym.RoomSchedule.scheduleID).limit(1000)).all()
+
+    def booking(number):
+        room, day, start = slot(rooms, today + timedelta(days=BOOKING_DAYS), number)
+        return {'roomId': room, 'scheduleDate': day.isoformat(), 'scheduleTime': start, 'bookingType': 'private',
+                'userID': MEMBER, 'isBooked': True, 'durationMinutes': 60}
+
+    def enrollment(number):
+        return {'courseName': f'LOAD-OPEN-{number // len(members)}', 'userID': members[number % len(members)]}
+
+    def recurrence(number):
+        # Four weekly occurrences; the next slot in the same room and hour starts four weeks later.
+        room, day, start = slot(rooms, today + timedelta(days=RECURRENCE_DAYS), number, days=28)
+        return {'roomId': room, 'bookingType': 'private', 'userID': MEMBER, 'weekdays': [gym.WEEKDAYS[day.weekday()]],
+                'startTime': start, 'durationMinutes': 60, 'startDate': day.isoformat(),
+                'endDate': (day + timedelta(days=27)).isoformat()}
+
+    def timetable(number):
+        week = today + timedelta(days=TIMETABLE_DAYS + 7 * number)
+        return {'weekStart': week.isoformat(), 'dryRun': False,
+                'demand': [{'courseName': 'LOAD-0', 'sessions': 3, 'rooms': [rooms[0]]}]}
+
+    def feedback(number):
+        return {'roomId': rooms[0], 'userID': members[number % len(members)],
+                'scheduleID': schedules[number % len(schedules)], 'score': 1 + number % 5, 'comment': 'load test'}
+
+    def waitlist(number):
+        return {'courseName': f'LOAD-FULL-{number // len(members)}', 'userID': members[number % len(members)]}
+
+    return [
+        ('api roomschedules POST', 'POST', '/api/v1/roomschedules', 'member', booking),
+        ('api user_courses POST', 'POST', '/api/v1/user_courses', 'admin', enrollment),
+        ('api recurrences POST', 'POST', '/api/v1/recurrences', 'admin', recurrence),
+        ('api timetable POST', 'POST', '/api/v1/timetable', 'admin', timetable),
+        ('api feedbacks POST', 'POST', '/api/v1/feedbacks', 'member', feedback),
+        ('api waitlists POST', 'POST', '/api/v1/waitlists', 'admin', waitlist),
+    ]
+
+
+def scenarios(gym, sizes):
+    """(name, method, path, credentials, body) for every API resource and page, using seeded keys."""
+    db = gym.db
+    today = date.today()
+    room = db.session.scalar(db.select(gym.Room.ID).order_by(gym.Room.ID))
+    schedule = db.session.scalar(db.select(gym.RoomSchedule.scheduleID).where(gym.RoomSchedule.scheduleDate >= today))
+    feedback = db.session.scalar(db.select(gym.Feedback.feedBackNo).order_by(gym.Feedback.feedBackNo))
+    instructor = db.session.scalar(db.select(gym.Course.InstructorID).where(gym.Course.courseName == 'LOAD-0'))
+    week = f'dateFrom={today.isoformat()}&dateTo={(today + timedelta(days=6)).isoformat()}'
+    login = {'SSN': MEMBER, 'password': MEMBER_PASSWORD}
+    return [
+        ('api auth/login', 'POST', '/api/v1/auth/login', None, login),
+        ('api memberships', 'GET', '/api/v1/memberships', None, None),
+        ('api memberships/<sign>', 'GET', '/api/v1/memberships/rm', None, None),
+        ('api users', 'GET', '/api/v1/users', 'admin', None),
+        ('api users/<ssn>', 'GET', '/api/v1/users/LOAD-1', 'admin', None),
+        ('api phones', 'GET', '/api/v1/phones', 'admin', None),
+        ('api phones/<phone>', 'GET', '/api/v1/phones/P-LOAD-1-0', 'admin', None),
+        ('api instructors', 'GET', '/api/v1/instructors', None, None),
+        ('api instructors/<ssn>', 'GET', f'/api/v1/instructors/{instructor}', None, None),
+        ('api rooms', 'GET', '/api/v1/rooms', None, None),
+        ('api rooms/<id>', 'GET', f'/api/v1/rooms/{room}', None, None),
+        ('api courses', 'GET', '/api/v1/courses', None, None),
+        ('api courses/<name>', 'GET', '/api/v1/courses/LOAD-0', None, None),
+        ('api roomschedules', 'GET', f'/api/v1/roomschedules?roomId={room}&{week}', 'admin', None),
+        ('api roomschedules/<id>', 'GET', f'/api/v1/roomschedules/{schedule}', 'admin', None),
+        ('api availability', 'GET', f'/api/v1/availability?rooms={room}&{week}', None, None),
+        ('api user_courses', 'GET', f'/api/v1/user_courses?userID={MEMBER}', 'admin', None),
+        ('api feedbacks', 'GET', f'/api/v1/feedbacks?roomId={room}', 'admin', None),
+        ('api feedbacks/<id>', 'GET', f'/api/v1/feedbacks/{feedback}', 'admin', None),
+        ('api ratings/<type>/<key>', 'GET', f'/api/v1/ratings/room/{room}', None, None),
+        ('api exports/user_courses', 'GET', '/api/v1/exports/user_courses', 'admin', None),
+        ('api exports/roomschedules week', 'GET', f'/api/v1/exports/roomschedules?{week}', 'admin', None),
+        ('page /login', 'GET', '/login', None, None),
+        ('page /register', 'GET', '/register', None, None),
+        ('page /admin/dashboard', 'GET', '/admin/dashboard', 'admin-page', None),
+        ('page /admin/users', 'GET', '/admin/users', 'admin-page', None),
+        ('page /admin/courses', 'GET', '/admin/courses', 'admin-page', None),
+        ('page /admin/rooms', 'GET', '/admin/rooms', 'admin-page', None),
+        ('page /admin/schedules', 'GET', '/admin/schedules', 'admin-page', None),
+        ('page /booking_admin', 'GET', '/booking_admin', 'admin-page', None),
+        ('page /member/dashboard', 'GET', '/member/dashboard', 'member-page', None),
+        ('page /member/profile', 'GET', '/member/profile', 'member-page', None),
+        ('page /member/courses', 'GET', '/member/courses', 'member-page', None),
+        ('page /member/bookings', 'GET', '/member/bookings', 'member-page', None),
+    ] + write_scenarios(gym, [f'LOAD-{number}' for number in range(sizes['members'])])
+
+
+def credentials(app):
+    """Request headers for each credential kind: bearer tokens for the API, session cookies for pages."""
+    headers = {None: {}}
+    for role, ssn, password in [('admin', 'ADMIN123', 'admin123'), ('member', MEMBER, MEMBER_PASSWORD)]:
+        client = app.test_client()
+        token = client.post('/api/v1/auth/login', json={'SSN': ssn, 'password': password}).json['token']
+        headers[role] = {'Authorization': f'Bearer {token}'}
+        response = client.post('/login', data={'ssn': ssn, 'password': password})
+        cookie = response.headers['Set-Cookie'].split(';', 1)[0]
+        headers[f'{role}-page'] = {'Cookie': cookie}
+    return headers
+
+
+def count_queries(app, totals):
+    """Count SQL statements per request on the server side, keyed by the X-Scenario header."""
+    from flask import g, has_request_context, request
+    from sqlalchemy import event
+
+    def count(*args):
+        if has_request_context():
+            g.load_test_queries = g.get('load_test_queries', 0) + 1
+
+    @app.after_request
+    def record(response):
+        name = request.headers.get('X-Scenario')
+        if name in totals:
+            # Streamed responses keep querying after this hook, so read the count once the body is sent.
+            state = g._get_current_object()
+
+            def close():
+                with totals['lock']:
+                    if name in totals:
+                        totals[name][0] += 1
+                        totals[name][1] += state.get('load_test_queries', 0)
+            response.call_on_close(close)
+        return response
+
+    event.listen(gym.db.engine, 'before_cursor_execute', count)
+
+
+def send(base, method, path, headers, body):
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        headers = {**headers, 'Content-Type': 'application/json'}
+    request = urllib.request.Request(base + path, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as error:
+        error.read()
+        return error.code
+
+
+def run(base, scenario, headers, totals, clients, seconds):
+    name, method, path, credential, body = scenario
+    headers = {**headers[credential], 'X-Scenario': urllib.parse.quote(name)}
+    numbers = itertools.count()
+    numbers_lock = threading.Lock()
+
+    def next_body():
+        if not callable(body):
+            return body
+        with numbers_lock:
+            number = next(numbers)
+        return body(number)
+
+    # One untimed request warms the caches the scenario relies on.
+    send(base, method, path, headers, next_body())
+    with totals['lock']:
+        totals[headers['X-Scenario']] = [0, 0]
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            began = time.perf_counter()
+            status = send(base, method, path, headers, next_body())
+            latencies.append((time.perf_counter() - began) * 1000)
+            if status >= 400:
+                errors.append(status)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    with totals['lock']:
+        served, statements = totals.pop(headers['X-Scenario'])
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'statuses': sorted(set(errors)),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+        'queries_per_request': round(statements / served, 2) if served else None,
+    }
+
+
+def compare(baseline, report, tolerance):
+    """Print per-scenario changes against a baseline report; returns the names that regressed."""
+    regressed = []
+    print(f'\nagainst {baseline.get("commit") or "baseline"}:')
+    for name, result in report['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if not before:
+            continue
+        slower = result['p95_ms'] > before['p95_ms'] * (1 + tolerance)
+        chattier = (result['queries_per_request'] or 0) > (before['queries_per_request'] or 0)
+        flag = '  REGRESSED' if slower or chattier else ''
+        print(f'  {name:<34} p95 {before["p95_ms"]:8.2f} -> {result["p95_ms"]:8.2f} ms'
+              f'  queries {before["queries_per_request"]} -> {result["queries_per_request"]}{flag}')
+        if flag:
+            regressed.append(name)
+    return regressed
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL to run against (default: a throwaway SQLite file)')
+    parser.add_argument('--scale', type=int, default=1, help='multiplier for the seeded data volume')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent clients per scenario')
+    parser.add_argument('--seconds', type=float, default=5, help='duration of each scenario')
+    parser.add_argument('--only', help='run only scenarios whose name contains this text')
+    parser.add_argument('--report', help='write the JSON report here instead of stdout')
+    parser.add_argument('--baseline', help='earlier JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='p95 growth over the baseline that counts as a regression')
+    args = parser.parse_args()
+
+    scratch = None
+    if not args.database:
+        scratch = tempfile.TemporaryDirectory()
+        args.database = f'sqlite:///{os.path.join(scratch.name, "load_test.db")}'
+    app = gym.create_app({'SQLALCHEMY_DATABASE_URI': args.database})
+
+    totals = {'lock': threading.Lock()}
+    with app.app_context():
+        count_queries(app, totals)
+        gym.initialize_database()
+        sizes = seed(gym, args.scale)
+        selected = [scenario for scenario in scenarios(gym, sizes) if not args.only or args.only in scenario[0]]
+        headers = credentials(app)
+        dialect = gym.db.engine.dialect.name
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    report = {'commit': git_commit(), 'database': dialect, 'python': platform.python_version(),
+              'cpus': os.cpu_count(), 'clients': args.clients, 'seconds': args.seconds, 'seed': sizes,
+              'scenarios': {}}
+    print(f'{dialect}, {args.clients} clients x {args.seconds:g}s per scenario, seed {sizes}', file=sys.stderr)
+    print(f'{"scenario":<34} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"queries":>8} {"errors":>7}',
+          file=sys.stderr)
+    for scenario in selected:
+        result = run(base, scenario, headers, totals, args.clients, args.seconds)
+        report['scenarios'][scenario[0]] = result
+        print(f'{scenario[0]:<34} {result["throughput_rps"]:>8.1f} {result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f}'
+              f' {result["p99_ms"]:>8.2f} {result["queries_per_request"]!s:>8} {result["errors"]:>7}', file=sys.stderr)
+    server.shutdown()
+    if scratch:
+        with app.app_context():
+            gym.db.engine.dispose()
+        scratch.cleanup()
+
+    if args.report:
+        with open(args.report, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressed = compare(json.load(handle), report, args.tolerance)
+        if regressed:
+            sys.exit(f'{len(regressed)} scenario(s) regressed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Fire concurrent enrollments at one course and check that it is never oversold.
+
+Run against the configured PostgreSQL database:
+
+    python benchmarks/stress_enrollment.py [capacity] [members]
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app, db, initialize_database, Course, Instructors, Room, Users, User_Course  # noqa: E402
+
+COURSE = 'StressTest'
+INSTRUCTOR = 'STRESS-INS'
+
+
+def seed(capacity, members):
+    User_Course.query.filter_by(courseName=COURSE).delete()
+    Course.query.filter_by(courseName=COURSE).delete()
+    Users.query.filter(Users.SSN.like('STRESS-%')).delete(synchronize_session=False)
+    if not Instructors.query.get(INSTRUCTOR):
+        db.session.add(Instructors(SSN=INSTRUCTOR, firstName='Stress', lastName='Test'))
+    db.session.add(Course(courseName=COURSE, capacity=capacity, isSpecial=False, InstructorID=INSTRUCTOR,
+                          roomId=Room.query.first().ID, seatsAvailable=capacity))
+    for number in range(members):
+        user = Users(SSN=f'STRESS-{number}', firstName='Member', lastName=str(number), membershipType='rm')
+        user.password_hash = 'unused'
+        db.session.add(user)
+    db.session.commit()
+
+
+def enroll(app, ssn, barrier):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_token'] = 'stress'
+        session['user_ssn'] = ssn
+    barrier.wait()
+    return client.post('/api/enroll_course', json={'course_name': COURSE}).status_code
+
+
+def main():
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    members = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    app = create_app()
+
+    with app.app_context():
+        initialize_database()
+        seed(capacity, members)
+
+    barrier = threading.Barrier(members)
+    with ThreadPoolExecutor(members) as executor:
+        futures = [executor.submit(enroll, app, f'STRESS-{number}', barrier) for number in range(members)]
+        results = Counter(future.result() for future in futures)
+
+    with app.app_context():
+        enrolled = User_Course.query.filter_by(courseName=COURSE).count()
+        seats = Course.query.get(COURSE).seatsAvailable
+
+    print(f'responses: {dict(results)}')
+    print(f'capacity {capacity}  enrolled {enrolled}  seatsAvailable {seats}')
+    assert enrolled == capacity == results[200], 'course was oversold or undersold'
+    assert seats == 0, 'seat counter drifted from enrollments'
+    print('OK: no oversell')
+
+
+if __name__ == '__main__':
+    main()
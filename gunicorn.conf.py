@@ -0,0 +1,15 @@
+"""Run several workers: gunicorn -c gunicorn.conf.py wsgi:app
+
+Every worker keeps its own connection pool, so size DATABASE_POOL_SIZE +
+DATABASE_MAX_OVERFLOW per worker such that workers * (pool_size + max_overflow)
+stays below the server's max_connections.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GYM_BIND', '0.0.0.0:5001')
+workers = int(os.environ.get('GYM_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GYM_THREADS', 4))
+# Create the schema and seed data once in the master; workers inherit the app and open fresh connections.
+preload_app = True
+timeout = 60
@@ -0,0 +1,40 @@
+"""course waitlists
+
+Revision ID: 2b7e4d9a1c35
+Revises: 6f1a9c3e2d58
+Create Date: 2026-10-17 21:04:37.215640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7e4d9a1c35'
+down_revision = '6f1a9c3e2d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('Waitlist',
+    sa.Column('waitlistID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('courseName', sa.String(length=20), nullable=False),
+    sa.Column('userID', sa.String(length=20), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('joinedAt', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['courseName'], ['Course.courseName'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['userID'], ['Users.SSN'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('waitlistID')
+    )
+    op.create_index('ix_Waitlist_courseName_priority_waitlistID', 'Waitlist', ['courseName', 'priority', 'waitlistID'],
+                    unique=False)
+    op.create_index('uq_Waitlist_courseName_userID', 'Waitlist', ['courseName', 'userID'], unique=True)
+    op.create_index(op.f('ix_Waitlist_userID'), 'Waitlist', ['userID'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_Waitlist_userID'), table_name='Waitlist')
+    op.drop_index('uq_Waitlist_courseName_userID', table_name='Waitlist')
+    op.drop_index('ix_Waitlist_courseName_priority_waitlistID', table_name='Waitlist')
+    op.drop_table('Waitlist')
@@ -0,0 +1,26 @@
+"""add RoomSchedule.durationMinutes
+
+Revision ID: 3f1c2a9d7b10
+Revises: e84b94fbdb56
+Create Date: 2026-10-17 10:12:41.318224
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = 'e84b94fbdb56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('RoomSchedule', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('durationMinutes', sa.Integer(), server_default='60', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('RoomSchedule', schema=None) as batch_op:
+        batch_op.drop_column('durationMinutes')
@@ -0,0 +1,35 @@
+"""per-table version counters for cached reference data
+
+Revision ID: 4c8b2e7f9a13
+Revises: d2a7f6c9e831
+Create Date: 2026-10-17 16:41:05.218337
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8b2e7f9a13'
+down_revision = 'd2a7f6c9e831'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table_version = op.create_table('TableVersion',
+    sa.Column('tableName', sa.String(length=30), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updatedAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('tableName')
+    )
+    op.bulk_insert(table_version, [
+        {'tableName': name, 'version': 0, 'updatedAt': datetime.utcnow()}
+        for name in ('Membership', 'Room', 'Instructors', 'Course')
+    ])
+
+
+def downgrade():
+    op.drop_table('TableVersion')
@@ -0,0 +1,33 @@
+"""materialized room occupancy matrix
+
+Revision ID: 5a9c7e1f3b62
+Revises: 8d3f6b2a9e47
+Create Date: 2026-10-18 00:41:19.806227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a9c7e1f3b62'
+down_revision = '8d3f6b2a9e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('RoomOccupancy',
+    sa.Column('roomId', sa.Integer(), nullable=False),
+    sa.Column('weekday', sa.SmallInteger(), nullable=False),
+    sa.Column('hour', sa.SmallInteger(), nullable=False),
+    sa.Column('bookingType', sa.String(length=10), nullable=False),
+    sa.Column('minutes', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['roomId'], ['Room.ID'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('roomId', 'weekday', 'hour', 'bookingType')
+    )
+    # Existing bookings are counted by `flask rebuild-occupancy` after the upgrade.
+
+
+def downgrade():
+    op.drop_table('RoomOccupancy')
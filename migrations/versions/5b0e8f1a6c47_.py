@@ -0,0 +1,43 @@
+"""indexes for list endpoint filters
+
+Revision ID: 5b0e8f1a6c47
+Revises: c7d93e0b4a25
+Create Date: 2026-10-17 13:41:55.027118
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5b0e8f1a6c47'
+down_revision = 'c7d93e0b4a25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_Users_membershipType', 'Users', ['membershipType'], unique=False)
+    op.create_index('ix_Phone_userSSN', 'Phone', ['userSSN'], unique=False)
+    op.create_index('ix_Course_InstructorID', 'Course', ['InstructorID'], unique=False)
+    op.create_index('ix_Course_roomId', 'Course', ['roomId'], unique=False)
+    op.create_index('ix_RoomSchedule_roomId_scheduleDate', 'RoomSchedule', ['roomId', 'scheduleDate'], unique=False)
+    op.create_index('ix_RoomSchedule_userID', 'RoomSchedule', ['userID'], unique=False)
+    op.create_index('ix_RoomSchedule_courseName', 'RoomSchedule', ['courseName'], unique=False)
+    op.create_index('ix_User_Course_userID', 'User_Course', ['userID'], unique=False)
+    op.create_index('ix_Feedback_roomId', 'Feedback', ['roomId'], unique=False)
+    op.create_index('ix_Feedback_userID', 'Feedback', ['userID'], unique=False)
+    op.create_index('ix_Feedback_scheduleID', 'Feedback', ['scheduleID'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_Feedback_scheduleID', table_name='Feedback')
+    op.drop_index('ix_Feedback_userID', table_name='Feedback')
+    op.drop_index('ix_Feedback_roomId', table_name='Feedback')
+    op.drop_index('ix_User_Course_userID', table_name='User_Course')
+    op.drop_index('ix_RoomSchedule_courseName', table_name='RoomSchedule')
+    op.drop_index('ix_RoomSchedule_userID', table_name='RoomSchedule')
+    op.drop_index('ix_RoomSchedule_roomId_scheduleDate', table_name='RoomSchedule')
+    op.drop_index('ix_Course_roomId', table_name='Course')
+    op.drop_index('ix_Course_InstructorID', table_name='Course')
+    op.drop_index('ix_Phone_userSSN', table_name='Phone')
+    op.drop_index('ix_Users_membershipType', table_name='Users')
@@ -0,0 +1,62 @@
+"""composite, covering and unique indexes for hot access paths
+
+Revision ID: 6f1a9c3e2d58
+Revises: 9e3d5a1b7c62
+Create Date: 2026-10-17 18:36:12.481903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f1a9c3e2d58'
+down_revision = '9e3d5a1b7c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    schedule = sa.table('RoomSchedule', sa.column('roomId', sa.Integer), sa.column('scheduleDate', sa.Date),
+                        sa.column('scheduleTime', sa.Time))
+    duplicates = op.get_bind().execute(
+        sa.select(schedule.c.roomId, schedule.c.scheduleDate, schedule.c.scheduleTime)
+        .group_by(schedule.c.roomId, schedule.c.scheduleDate, schedule.c.scheduleTime)
+        .having(sa.func.count() > 1)
+        .limit(20)
+    ).all()
+    if duplicates:
+        # Double bookings need a human decision; refuse rather than delete someone's booking.
+        raise RuntimeError('RoomSchedule has several bookings starting in the same room slot, resolve them first: '
+                           + ', '.join(f'room {room} {day} {start}' for room, day, start in duplicates))
+
+    op.create_index('uq_RoomSchedule_slot', 'RoomSchedule', ['roomId', 'scheduleDate', 'scheduleTime'], unique=True)
+    op.drop_index('ix_RoomSchedule_roomId_scheduleDate', table_name='RoomSchedule')
+    op.create_index('ix_RoomSchedule_userID_scheduleDate', 'RoomSchedule', ['userID', 'scheduleDate', 'scheduleTime'],
+                    unique=False)
+    op.drop_index('ix_RoomSchedule_userID', table_name='RoomSchedule')
+    op.create_index('ix_RoomSchedule_scheduleDate', 'RoomSchedule', ['scheduleDate'], unique=False)
+    op.create_index('ix_User_Course_userID_courseName', 'User_Course', ['userID', 'courseName'], unique=False)
+    op.drop_index('ix_User_Course_userID', table_name='User_Course')
+    op.create_index('ix_Phone_userSSN_phone', 'Phone', ['userSSN', 'phone'], unique=False)
+    op.drop_index('ix_Phone_userSSN', table_name='Phone')
+    op.create_index('ix_Feedback_roomId_feedBackNo', 'Feedback', ['roomId', 'feedBackNo'], unique=False)
+    op.drop_index('ix_Feedback_roomId', table_name='Feedback')
+    op.create_index('ix_Feedback_userID_feedBackNo', 'Feedback', ['userID', 'feedBackNo'], unique=False)
+    op.drop_index('ix_Feedback_userID', table_name='Feedback')
+
+
+def downgrade():
+    op.create_index('ix_Feedback_userID', 'Feedback', ['userID'], unique=False)
+    op.drop_index('ix_Feedback_userID_feedBackNo', table_name='Feedback')
+    op.create_index('ix_Feedback_roomId', 'Feedback', ['roomId'], unique=False)
+    op.drop_index('ix_Feedback_roomId_feedBackNo', table_name='Feedback')
+    op.create_index('ix_Phone_userSSN', 'Phone', ['userSSN'], unique=False)
+    op.drop_index('ix_Phone_userSSN_phone', table_name='Phone')
+    op.create_index('ix_User_Course_userID', 'User_Course', ['userID'], unique=False)
+    op.drop_index('ix_User_Course_userID_courseName', table_name='User_Course')
+    op.drop_index('ix_RoomSchedule_scheduleDate', table_name='RoomSchedule')
+    op.create_index('ix_RoomSchedule_userID', 'RoomSchedule', ['userID'], unique=False)
+    op.drop_index('ix_RoomSchedule_userID_scheduleDate', table_name='RoomSchedule')
+    op.create_index('ix_RoomSchedule_roomId_scheduleDate', 'RoomSchedule', ['roomId', 'scheduleDate'], unique=False)
+    op.drop_index('uq_RoomSchedule_slot', table_name='RoomSchedule')
@@ -0,0 +1,29 @@
+"""version counter for cached principals of the Users table
+
+Revision ID: 7d2c9f4b1e85
+Revises: e5b2a8d4c916
+Create Date: 2026-10-18 10:03:51.772640
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2c9f4b1e85'
+down_revision = 'e5b2a8d4c916'
+branch_labels = None
+depends_on = None
+
+table_version = sa.table('TableVersion', sa.column('tableName', sa.String), sa.column('version', sa.Integer),
+                         sa.column('updatedAt', sa.DateTime))
+
+
+def upgrade():
+    op.bulk_insert(table_version, [{'tableName': 'Users', 'version': 0, 'updatedAt': datetime.utcnow()}])
+
+
+def downgrade():
+    op.execute(table_version.delete().where(table_version.c.tableName == 'Users'))
@@ -0,0 +1,31 @@
+"""add Course.seatsAvailable seat counter
+
+Revision ID: 8a4e6d2c51f3
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 11:02:09.551870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d2c51f3'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Course', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('seatsAvailable', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute(
+        'UPDATE "Course" SET "seatsAvailable" = "capacity" - '
+        '(SELECT COUNT(*) FROM "User_Course" WHERE "User_Course"."courseName" = "Course"."courseName")'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('Course', schema=None) as batch_op:
+        batch_op.drop_column('seatsAvailable')
@@ -0,0 +1,31 @@
+"""feed versions for cached iCalendar feeds
+
+Revision ID: 8d3f6b2a9e47
+Revises: 2b7e4d9a1c35
+Create Date: 2026-10-17 23:12:08.540318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3f6b2a9e47'
+down_revision = '2b7e4d9a1c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('FeedVersion',
+    sa.Column('feedKey', sa.String(length=40), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updatedAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('feedKey')
+    )
+    op.create_index(op.f('ix_FeedVersion_updatedAt'), 'FeedVersion', ['updatedAt'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_FeedVersion_updatedAt'), table_name='FeedVersion')
+    op.drop_table('FeedVersion')
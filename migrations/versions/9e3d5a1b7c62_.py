@@ -0,0 +1,56 @@
+"""rating summaries for rooms, courses and instructors
+
+Revision ID: 9e3d5a1b7c62
+Revises: 4c8b2e7f9a13
+Create Date: 2026-10-17 17:52:44.730915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e3d5a1b7c62'
+down_revision = '4c8b2e7f9a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('RatingSummary',
+    sa.Column('subjectType', sa.String(length=10), nullable=False),
+    sa.Column('subjectKey', sa.String(length=20), nullable=False),
+    sa.Column('ratingCount', sa.Integer(), nullable=False),
+    sa.Column('ratingSum', sa.Numeric(precision=12, scale=1), nullable=False),
+    sa.Column('stars1', sa.Integer(), nullable=False),
+    sa.Column('stars2', sa.Integer(), nullable=False),
+    sa.Column('stars3', sa.Integer(), nullable=False),
+    sa.Column('stars4', sa.Integer(), nullable=False),
+    sa.Column('stars5', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('subjectType', 'subjectKey')
+    )
+
+    feedback = sa.table('Feedback', sa.column('roomId', sa.Integer), sa.column('scheduleID', sa.Integer),
+                        sa.column('score', sa.Numeric))
+    schedule = sa.table('RoomSchedule', sa.column('scheduleID', sa.Integer), sa.column('courseName', sa.String))
+    course = sa.table('Course', sa.column('courseName', sa.String), sa.column('InstructorID', sa.String))
+    summary = sa.table('RatingSummary', *[sa.column(name) for name in (
+        'subjectType', 'subjectKey', 'ratingCount', 'ratingSum', 'stars1', 'stars2', 'stars3', 'stars4', 'stars5')])
+    # Whole stars rounded half up, clamped to 1-5, as app.rating_stars does.
+    stars = sa.case((feedback.c.score < 1.5, 1), (feedback.c.score < 2.5, 2), (feedback.c.score < 3.5, 3),
+                    (feedback.c.score < 4.5, 4), else_=5)
+    aggregates = [sa.func.count(), sa.func.sum(feedback.c.score)] + \
+        [sa.func.sum(sa.case((stars == bucket, 1), else_=0)) for bucket in range(1, 6)]
+
+    rated = feedback.join(schedule, schedule.c.scheduleID == feedback.c.scheduleID)
+    classes = rated.join(course, course.c.courseName == schedule.c.courseName)
+    for subject_type, key, source in [('room', sa.cast(feedback.c.roomId, sa.String), feedback),
+                                      ('course', course.c.courseName, classes),
+                                      ('instructor', course.c.InstructorID, classes)]:
+        op.execute(summary.insert().from_select(
+            [column.name for column in summary.c],
+            sa.select(sa.literal(subject_type), key, *aggregates).select_from(source).group_by(key)))
+
+
+def downgrade():
+    op.drop_table('RatingSummary')
@@ -0,0 +1,29 @@
+"""version counter for the live course seat counts
+
+Revision ID: a3f6d1c8e402
+Revises: 7d2c9f4b1e85
+Create Date: 2026-10-18 11:24:07.318905
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f6d1c8e402'
+down_revision = '7d2c9f4b1e85'
+branch_labels = None
+depends_on = None
+
+table_version = sa.table('TableVersion', sa.column('tableName', sa.String), sa.column('version', sa.Integer),
+                         sa.column('updatedAt', sa.DateTime))
+
+
+def upgrade():
+    op.bulk_insert(table_version, [{'tableName': 'CourseSeats', 'version': 0, 'updatedAt': datetime.utcnow()}])
+
+
+def downgrade():
+    op.execute(table_version.delete().where(table_version.c.tableName == 'CourseSeats'))
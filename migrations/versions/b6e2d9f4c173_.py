@@ -0,0 +1,38 @@
+"""per-user versions for cached principals
+
+Revision ID: b6e2d9f4c173
+Revises: a3f6d1c8e402
+Create Date: 2026-10-18 14:37:22.905118
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2d9f4c173'
+down_revision = 'a3f6d1c8e402'
+branch_labels = None
+depends_on = None
+
+table_version = sa.table('TableVersion', sa.column('tableName', sa.String), sa.column('version', sa.Integer),
+                         sa.column('updatedAt', sa.DateTime))
+
+
+def upgrade():
+    op.create_table('PrincipalVersion',
+    sa.Column('userSSN', sa.String(length=20), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updatedAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('userSSN')
+    )
+    op.create_index(op.f('ix_PrincipalVersion_updatedAt'), 'PrincipalVersion', ['updatedAt'], unique=False)
+    op.execute(table_version.delete().where(table_version.c.tableName == 'Users'))
+
+
+def downgrade():
+    op.bulk_insert(table_version, [{'tableName': 'Users', 'version': 0, 'updatedAt': datetime.utcnow()}])
+    op.drop_index(op.f('ix_PrincipalVersion_updatedAt'), table_name='PrincipalVersion')
+    op.drop_table('PrincipalVersion')
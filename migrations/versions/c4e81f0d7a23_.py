@@ -0,0 +1,36 @@
+"""slot events for the live availability streams
+
+Revision ID: c4e81f0d7a23
+Revises: 5a9c7e1f3b62
+Create Date: 2026-10-18 02:17:44.351208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e81f0d7a23'
+down_revision = '5a9c7e1f3b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('SlotEvent',
+    sa.Column('eventID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=5), nullable=False),
+    sa.Column('scheduleID', sa.Integer(), nullable=False),
+    sa.Column('roomId', sa.Integer(), nullable=False),
+    sa.Column('scheduleDate', sa.Date(), nullable=False),
+    sa.Column('startMinute', sa.SmallInteger(), nullable=False),
+    sa.Column('endMinute', sa.SmallInteger(), nullable=False),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('eventID')
+    )
+    op.create_index(op.f('ix_SlotEvent_createdAt'), 'SlotEvent', ['createdAt'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_SlotEvent_createdAt'), table_name='SlotEvent')
+    op.drop_table('SlotEvent')
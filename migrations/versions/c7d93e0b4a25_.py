@@ -0,0 +1,57 @@
+"""key Blacklist by token digest and record token expiry
+
+Revision ID: c7d93e0b4a25
+Revises: 8a4e6d2c51f3
+Create Date: 2026-10-17 12:20:37.904113
+
+"""
+import hashlib
+from datetime import datetime, timedelta
+
+from alembic import op
+import jwt
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d93e0b4a25'
+down_revision = '8a4e6d2c51f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Blacklist', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tokenHash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('expiresAt', sa.DateTime(), nullable=True))
+
+    blacklist = sa.table('Blacklist', sa.column('id', sa.Integer), sa.column('token', sa.String),
+                         sa.column('tokenHash', sa.String), sa.column('expiresAt', sa.DateTime))
+    connection = op.get_bind()
+    for row_id, token in connection.execute(sa.select(blacklist.c.id, blacklist.c.token)).all():
+        try:
+            expires_at = datetime.utcfromtimestamp(jwt.decode(token, options={'verify_signature': False})['exp'])
+        except (jwt.InvalidTokenError, KeyError):
+            expires_at = datetime.utcnow() + timedelta(hours=24)
+        connection.execute(blacklist.update().where(blacklist.c.id == row_id).values(
+            tokenHash=hashlib.sha256(token.encode()).hexdigest(), expiresAt=expires_at))
+
+    with op.batch_alter_table('Blacklist', schema=None) as batch_op:
+        batch_op.alter_column('tokenHash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('expiresAt', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_unique_constraint('Blacklist_tokenHash_key', ['tokenHash'])
+        batch_op.create_index('ix_Blacklist_expiresAt', ['expiresAt'], unique=False)
+        batch_op.drop_constraint('Blacklist_token_key', type_='unique')
+        batch_op.drop_column('token')
+
+
+def downgrade():
+    # Raw tokens cannot be recovered from their digests, so revocations are dropped.
+    op.execute('DELETE FROM "Blacklist"')
+    with op.batch_alter_table('Blacklist', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=500), nullable=False))
+        batch_op.create_unique_constraint('Blacklist_token_key', ['token'])
+        batch_op.drop_index('ix_Blacklist_expiresAt')
+        batch_op.drop_constraint('Blacklist_tokenHash_key', type_='unique')
+        batch_op.drop_column('expiresAt')
+        batch_op.drop_column('tokenHash')
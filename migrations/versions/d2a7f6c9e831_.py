@@ -0,0 +1,48 @@
+"""recurring schedule definitions
+
+Revision ID: d2a7f6c9e831
+Revises: 5b0e8f1a6c47
+Create Date: 2026-10-17 15:08:12.664930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7f6c9e831'
+down_revision = '5b0e8f1a6c47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('RecurringSchedule',
+    sa.Column('recurrenceID', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('roomId', sa.Integer(), nullable=False),
+    sa.Column('bookingType', sa.String(length=10), nullable=False),
+    sa.Column('userID', sa.String(length=20), nullable=True),
+    sa.Column('courseName', sa.String(length=20), nullable=True),
+    sa.Column('weekdays', sa.String(length=27), nullable=False),
+    sa.Column('startTime', sa.Time(), nullable=False),
+    sa.Column('durationMinutes', sa.Integer(), nullable=False),
+    sa.Column('startDate', sa.Date(), nullable=False),
+    sa.Column('endDate', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['courseName'], ['Course.courseName'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['roomId'], ['Room.ID'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['userID'], ['Users.SSN'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('recurrenceID')
+    )
+    with op.batch_alter_table('RoomSchedule', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recurrenceID', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_RoomSchedule_recurrenceID', ['recurrenceID'], unique=False)
+        batch_op.create_foreign_key('RoomSchedule_recurrenceID_fkey', 'RecurringSchedule', ['recurrenceID'],
+                                    ['recurrenceID'], ondelete='CASCADE')
+
+
+def downgrade():
+    with op.batch_alter_table('RoomSchedule', schema=None) as batch_op:
+        batch_op.drop_constraint('RoomSchedule_recurrenceID_fkey', type_='foreignkey')
+        batch_op.drop_index('ix_RoomSchedule_recurrenceID')
+        batch_op.drop_column('recurrenceID')
+    op.drop_table('RecurringSchedule')
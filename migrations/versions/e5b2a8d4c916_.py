@@ -0,0 +1,50 @@
+"""exclusion constraint against overlapping room bookings
+
+Revision ID: e5b2a8d4c916
+Revises: c4e81f0d7a23
+Create Date: 2026-10-18 09:12:36.540172
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2a8d4c916'
+down_revision = 'c4e81f0d7a23'
+branch_labels = None
+depends_on = None
+
+
+def booking_span(table=''):
+    """Half-open time range a booking occupies; ``table`` qualifies the columns."""
+    start = f'{table}"scheduleDate" + {table}"scheduleTime"'
+    return f'tsrange({start}, {start} + make_interval(mins => {table}"durationMinutes"))'
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    overlaps = bind.execute(sa.text(f'''
+        SELECT a."roomId", a."scheduleDate", a."scheduleTime", b."scheduleTime"
+        FROM "RoomSchedule" a JOIN "RoomSchedule" b
+          ON a."roomId" = b."roomId" AND a."scheduleDate" = b."scheduleDate" AND a."scheduleID" < b."scheduleID"
+        WHERE {booking_span('a.')} && {booking_span('b.')}
+        LIMIT 20
+    ''')).all()
+    if overlaps:
+        # Double bookings need a human decision; refuse rather than delete someone's booking.
+        raise RuntimeError('RoomSchedule has overlapping bookings in the same room, resolve them first: '
+                           + ', '.join(f'room {room} {day} {first} and {second}'
+                                       for room, day, first, second in overlaps))
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_exclude_constraint('ex_RoomSchedule_overlap', 'RoomSchedule',
+                                 ('roomId', '='), (sa.text(booking_span()), '&&'), using='gist')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_constraint('ex_RoomSchedule_overlap', 'RoomSchedule')
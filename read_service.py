@@ -0,0 +1,403 @@
+"""Async read-only service for the high fan-out reads: course catalog, rooms, availability, bookings.
+
+Shares the models, settings and response shapes of ``app.py`` but runs on ASGI with
+its own async engine and pool (asyncpg, or aiosqlite for SQLite), so a waiting query
+holds a coroutine instead of a worker thread. A proxy routes these GETs here and
+everything else to the Flask workers:
+
+    uvicorn --factory read_service:create_read_service --workers 2 --port 5002
+
+It also serves the live availability streams: server-sent events fed by one SlotEvent
+poller per process, so an idle stream holds a queue rather than a database connection.
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+
+import jwt
+from flask import Config
+from flask_restx import marshal
+from sqlalchemy import exists, func, or_, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app import booking_interval, course_model, engine_options, id_list, room_model, roomschedule_model, \
+    slot_minutes, token_digest, Blacklist, DefaultConfig, Course, Room, RoomSchedule, RoomScheduleIndex, SlotEvent, Users
+from timetable import span_mask
+
+logger = logging.getLogger(__name__)
+ASYNC_DRIVERS = {'postgresql': 'postgresql+asyncpg', 'sqlite': 'sqlite+aiosqlite'}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def async_database_url(url):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+
+def async_engine_options(settings):
+    """engine_options() sized by the READ_SERVICE_* settings, with the statement timeout in asyncpg's form."""
+    options = engine_options({**settings, 'DATABASE_POOL_SIZE': settings['READ_SERVICE_POOL_SIZE'],
+                              'DATABASE_MAX_OVERFLOW': settings['READ_SERVICE_MAX_OVERFLOW'],
+                              'DATABASE_STATEMENT_TIMEOUT': 0})
+    timeout = settings['DATABASE_STATEMENT_TIMEOUT']
+    if make_url(settings['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'postgresql' and timeout:
+        options['connect_args'] = {'server_settings': {'statement_timeout': str(int(timeout))}}
+    return options
+
+
+def argument(request, name, parse, default=None):
+    value = request.query_params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return parse(value)
+    except ValueError as error:
+        raise BadRequest(f'{name}: {error}')
+
+
+def page_arguments(request, key):
+    settings = request.app.state.settings
+    limit = argument(request, 'limit', int, settings['PAGE_SIZE_DEFAULT'])
+    if not 1 <= limit <= settings['PAGE_SIZE_MAX']:
+        raise BadRequest(f"limit must be between 1 and {settings['PAGE_SIZE_MAX']}")
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except ValueError:
+            raise BadRequest('Invalid cursor')
+        if not isinstance(cursor, list) or len(cursor) != 1 or type(cursor[0]) is not key.type.python_type:
+            raise BadRequest('Invalid cursor')
+        cursor = cursor[0]
+    return limit, cursor
+
+
+def page_response(rows, limit, key, model):
+    """Same body and X-Next-Cursor header as app.next_page()."""
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers['X-Next-Cursor'] = base64.urlsafe_b64encode(json.dumps([getattr(rows[-1], key)]).encode()).decode()
+    return JSONResponse(marshal([row._asdict() for row in rows], model), headers=headers)
+
+
+def sort_key(column, dialect):
+    # Byte order, so cursors match the Python-sorted pages of the Flask workers.
+    return column.collate('C') if dialect == 'postgresql' else column
+
+
+async def fetch(request, statement):
+    async with request.app.state.engine.connect() as connection:
+        return (await connection.execute(statement)).all()
+
+
+async def authenticate(request):
+    """The caller's (SSN, membershipType) row for a valid, unrevoked bearer token, or None."""
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    token = header[len('Bearer '):]
+    try:
+        claims = jwt.decode(token, request.app.state.settings['SECRET_KEY'], algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        return None
+    rows = await fetch(request, select(Users.SSN, Users.membershipType).where(
+        Users.SSN == claims.get('ssn'), ~exists().where(Blacklist.tokenHash == token_digest(token))))
+    return rows[0] if rows else None
+
+
+async def list_courses(request):
+    limit, after = page_arguments(request, Course.courseName)
+    dialect = request.app.state.engine.dialect.name
+    key = sort_key(Course.courseName, dialect)
+    statement = select(*Course.__table__.c).order_by(key).limit(limit + 1)
+    if after is not None:
+        statement = statement.where(key > after)
+    for name, parse in (('InstructorID', str), ('roomId', int), ('isSpecial', parse_boolean)):
+        value = argument(request, name, parse)
+        if value is not None:
+            statement = statement.where(Course.__table__.c[name] == value)
+    return page_response(await fetch(request, statement), limit, 'courseName', course_model)
+
+
+async def list_rooms(request):
+    rooms = await fetch(request, select(Room.ID, Room.roomName).order_by(Room.ID))
+    return JSONResponse(marshal([room._asdict() for room in rooms], room_model))
+
+
+async def availability_window(request):
+    """The rooms, days and slot width an availability request asks for, with AvailabilityAPI's defaults."""
+    settings = request.app.state.settings
+    first_day = argument(request, 'dateFrom', date.fromisoformat) or datetime.utcnow().date()
+    last_day = argument(request, 'dateTo', date.fromisoformat) or first_day + timedelta(days=6)
+    if not 0 <= (last_day - first_day).days < settings['AVAILABILITY_MAX_DAYS']:
+        raise BadRequest(f"Window must span 1 to {settings['AVAILABILITY_MAX_DAYS']} days")
+    width = argument(request, 'slotMinutes', slot_minutes, 60)
+    known = [room_id for room_id, in await fetch(request, select(Room.ID).order_by(Room.ID))]
+    room_ids = argument(request, 'rooms', id_list) or known
+    if len(room_ids) > settings['AVAILABILITY_MAX_ROOMS']:
+        raise BadRequest(f"At most {settings['AVAILABILITY_MAX_ROOMS']} rooms per request")
+    unknown = set(room_ids) - set(known)
+    if unknown:
+        raise BadRequest(f"Unknown rooms: {', '.join(map(str, sorted(unknown)))}")
+    return room_ids, first_day, last_day, width
+
+
+async def booked_intervals(request, room_ids, first_day, last_day):
+    """{(roomId, day): {scheduleID: (start, end)}} for every room and day of the window."""
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    bookings = {(room_id, day): {} for room_id in room_ids for day in days}
+    rows = await fetch(request, select(
+        RoomSchedule.scheduleID, RoomSchedule.roomId, RoomSchedule.scheduleDate, RoomSchedule.scheduleTime,
+        RoomSchedule.durationMinutes, RoomSchedule.bookingType
+    ).where(RoomSchedule.roomId.in_(room_ids), RoomSchedule.scheduleDate.between(first_day, last_day)))
+    for row in rows:
+        bookings[(row.roomId, row.scheduleDate)][row.scheduleID] = booking_interval(row)
+    return bookings
+
+
+def slot_masks(width):
+    return [(start, span_mask(start, start + width, RoomScheduleIndex.MASK_MINUTES))
+            for start in range(0, 24 * 60, width)]
+
+
+def occupied_slots(intervals, slots):
+    """Start times ('09:00') of the slots that overlap any of the intervals."""
+    mask = 0
+    for start, end in intervals:
+        mask |= span_mask(start, end, RoomScheduleIndex.MASK_MINUTES)
+    return [f'{start // 60:02d}:{start % 60:02d}' for start, bits in slots if mask & bits]
+
+
+def availability_body(room_ids, first_day, last_day, width, bookings):
+    slots = slot_masks(width)
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    return {
+        'dateFrom': first_day.isoformat(),
+        'dateTo': last_day.isoformat(),
+        'slotMinutes': width,
+        'rooms': [
+            {'roomId': room_id, 'days': {
+                day.isoformat(): {'occupied': occupied_slots(bookings[(room_id, day)].values(), slots)}
+                for day in days
+            }}
+            for room_id in room_ids
+        ]
+    }
+
+
+async def availability(request):
+    """Same answer as AvailabilityAPI, computed from one query instead of the per-worker schedule index."""
+    room_ids, first_day, last_day, width = await availability_window(request)
+    bookings = await booked_intervals(request, room_ids, first_day, last_day)
+    return JSONResponse(availability_body(room_ids, first_day, last_day, width, bookings))
+
+
+class SlotStream:
+    """One open availability stream: the rooms and days it shows, its queue and its bookings."""
+
+    def __init__(self, room_ids, first_day, last_day, queue_size):
+        self.room_ids = set(room_ids)
+        self.first_day = first_day
+        self.last_day = last_day
+        self.queue = asyncio.Queue(queue_size)
+        self.bookings = {}
+        self.latest = {}
+
+    def apply(self, change, slots):
+        """Apply one SlotEvent to the bookings; returns the slots it took and the slots it freed."""
+        if change.eventID <= self.latest.get(change.scheduleID, 0):
+            return [], []
+        self.latest[change.scheduleID] = change.eventID
+        intervals = self.bookings.setdefault((change.roomId, change.scheduleDate), {})
+        before = occupied_slots(intervals.values(), slots)
+        if change.kind == 'taken':
+            intervals[change.scheduleID] = (change.startMinute, change.endMinute)
+        else:
+            intervals.pop(change.scheduleID, None)
+        after = occupied_slots(intervals.values(), slots)
+        return [slot for slot in after if slot not in before], [slot for slot in before if slot not in after]
+
+
+class SlotFeed:
+    """Polls SlotEvent once per interval for every availability stream of this process."""
+
+    GAP_SECONDS = 10
+    MAX_GAP = 1000
+
+    def __init__(self, engine, interval, queue_size):
+        self.engine = engine
+        self.interval = interval
+        self.queue_size = queue_size
+        self.last_id = None
+        self._gaps = {}
+        self._streams = {}
+
+    def subscribe(self, room_ids, first_day, last_day):
+        stream = SlotStream(room_ids, first_day, last_day, self.queue_size)
+        for room_id in stream.room_ids:
+            self._streams.setdefault(room_id, set()).add(stream)
+        return stream
+
+    def unsubscribe(self, stream):
+        for room_id in stream.room_ids:
+            watchers = self._streams.get(room_id)
+            if watchers is not None:
+                watchers.discard(stream)
+                if not watchers:
+                    del self._streams[room_id]
+
+    def publish(self, row):
+        for stream in list(self._streams.get(row.roomId, ())):
+            if not stream.first_day <= row.scheduleDate <= stream.last_day:
+                continue
+            try:
+                stream.queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self.unsubscribe(stream)
+                while not stream.queue.empty():
+                    stream.queue.get_nowait()
+                stream.queue.put_nowait(None)
+
+    async def poll(self):
+        async with self.engine.connect() as connection:
+            if self.last_id is None:
+                self.last_id = (await connection.execute(select(func.max(SlotEvent.eventID)))).scalar() or 0
+                return
+            now = time.monotonic()
+            self._gaps = {event_id: expires for event_id, expires in self._gaps.items() if expires > now}
+            condition = SlotEvent.eventID > self.last_id
+            if self._gaps:
+                condition = or_(condition, SlotEvent.eventID.in_(list(self._gaps)))
+            rows = (await connection.execute(select(SlotEvent).where(condition).order_by(SlotEvent.eventID))).all()
+        for row in rows:
+            if row.eventID > self.last_id:
+                if row.eventID - self.last_id <= self.MAX_GAP:
+                    self._gaps.update((event_id, now + self.GAP_SECONDS)
+                                      for event_id in range(self.last_id + 1, row.eventID))
+                self.last_id = row.eventID
+            self._gaps.pop(row.eventID, None)
+            self.publish(row)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception('Polling slot events failed; retrying')
+
+
+def server_event(name, data):
+    return f'event: {name}\ndata: {json.dumps(data)}\n\n'
+
+
+async def availability_stream(request):
+    """Server-sent events: ``availability`` with the AvailabilityAPI body, then ``slot-taken`` and
+    ``slot-freed`` with the slots of one room and day that changed as bookings commit."""
+    room_ids, first_day, last_day, width = await availability_window(request)
+    feed = request.app.state.slot_feed
+    # Subscribe before the snapshot so nothing committed in between is missed; replaying is harmless.
+    stream = feed.subscribe(room_ids, first_day, last_day)
+    try:
+        stream.bookings = await booked_intervals(request, room_ids, first_day, last_day)
+    except BaseException:
+        feed.unsubscribe(stream)
+        raise
+    slots = slot_masks(width)
+    heartbeat = request.app.state.settings['SLOT_STREAM_HEARTBEAT']
+
+    async def events():
+        try:
+            yield server_event('availability',
+                               availability_body(room_ids, first_day, last_day, width, stream.bookings))
+            while True:
+                try:
+                    change = await asyncio.wait_for(stream.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if change is None:
+                    return
+                for name, changed in zip(('slot-taken', 'slot-freed'), stream.apply(change, slots)):
+                    if changed:
+                        yield server_event(name, {'roomId': change.roomId, 'date': change.scheduleDate.isoformat(),
+                                                  'slots': changed})
+        finally:
+            feed.unsubscribe(stream)
+
+    return StreamingResponse(events(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+async def list_bookings(request):
+    user = await authenticate(request)
+    if user is None:
+        return JSONResponse({'message': 'Unauthorized'}, status_code=401)
+    limit, after = page_arguments(request, RoomSchedule.scheduleID)
+    statement = select(*RoomSchedule.__table__.c).where(RoomSchedule.userID == user.SSN) \
+        .order_by(RoomSchedule.scheduleID).limit(limit + 1)
+    if after is not None:
+        statement = statement.where(RoomSchedule.scheduleID > after)
+    first_day = argument(request, 'dateFrom', date.fromisoformat)
+    if first_day:
+        statement = statement.where(RoomSchedule.scheduleDate >= first_day)
+    last_day = argument(request, 'dateTo', date.fromisoformat)
+    if last_day:
+        statement = statement.where(RoomSchedule.scheduleDate <= last_day)
+    return page_response(await fetch(request, statement), limit, 'scheduleID', roomschedule_model)
+
+
+def parse_boolean(value):
+    if value.lower() in ('true', '1', 'yes', 'on'):
+        return True
+    if value.lower() in ('false', '0', 'no', 'off'):
+        return False
+    raise ValueError(f'{value} is not a boolean')
+
+
+async def bad_request(request, error):
+    return JSONResponse({'message': str(error)}, status_code=400)
+
+
+def create_read_service(config=None):
+    """Build the ASGI app from app.py's settings, ``FLASK_*`` environment variables and ``config``."""
+    settings = Config(os.path.dirname(os.path.abspath(__file__)))
+    settings.from_object(DefaultConfig)
+    settings.from_prefixed_env()
+    settings.update(config or {})
+    engine = create_async_engine(async_database_url(settings['SQLALCHEMY_DATABASE_URI']),
+                                 **async_engine_options(settings))
+    slot_feed = SlotFeed(engine, settings['SLOT_STREAM_POLL_INTERVAL'], settings['SLOT_STREAM_QUEUE_SIZE'])
+
+    @asynccontextmanager
+    async def lifespan(service):
+        await slot_feed.poll()  # start from the newest event before any stream subscribes
+        poller = asyncio.create_task(slot_feed.run())
+        yield
+        poller.cancel()
+        await engine.dispose()
+
+    service = Starlette(routes=[
+        Route('/api/v1/courses', list_courses),
+        Route('/api/v1/rooms', list_rooms),
+        Route('/api/v1/availability', availability),
+        Route('/api/v1/availability/stream', availability_stream),
+        Route('/api/v1/bookings', list_bookings),
+    ], exception_handlers={BadRequest: bad_request}, lifespan=lifespan)
+    service.state.settings = settings
+    service.state.engine = engine
+    service.state.slot_feed = slot_feed
+    return service
@@ -0,0 +1,155 @@
+"""Weekly timetable generator.
+
+Each day is a grid of ``granularity``-minute slots and every room and instructor
+keeps one integer bitmask of free slots per day, so testing a placement is a
+couple of bitwise operations. Sessions are ordered most-constrained first and
+placed by depth-first search with backtracking; once ``backtrack_budget``
+backtracks have been spent the search stops backtracking and reports whatever it
+cannot place instead of spending more time on it.
+"""
+from collections import namedtuple
+
+Demand = namedtuple('Demand', 'course instructor rooms sessions duration')
+Placement = namedtuple('Placement', 'course instructor room day start end')
+
+DAY_MINUTES = 24 * 60
+
+
+def window_mask(start, end, granularity):
+    """Bitmask of the slots fully inside [start, end) minutes."""
+    first = -(-start // granularity)
+    last = end // granularity
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+def span_mask(start, end, granularity):
+    """Bitmask of every slot touched by [start, end) minutes."""
+    first = start // granularity
+    last = min(-(-end // granularity), DAY_MINUTES // granularity)
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+def run_starts(mask, length):
+    """Bitmask of the positions where ``length`` consecutive set bits of ``mask`` begin."""
+    starts = mask
+    for shift in range(1, length):
+        starts &= mask >> shift
+    return starts
+
+
+def free_masks(availability, busy, days, granularity):
+    """Per-day free-slot masks from availability windows minus busy intervals.
+
+    ``availability`` maps day -> [(start, end)], ``busy`` maps day -> [(start, end)],
+    both in minutes since midnight.
+    """
+    masks = {}
+    for day in days:
+        mask = 0
+        for start, end in availability.get(day, ()):
+            mask |= window_mask(start, end, granularity)
+        for start, end in busy.get(day, ()):
+            mask &= ~span_mask(start, end, granularity)
+        masks[day] = mask
+    return masks
+
+
+class TimetableSolver:
+    def __init__(self, room_free, instructor_free, days, granularity=15, cleaning_gap=15, backtrack_budget=2000):
+        self.room_free = {room: dict(masks) for room, masks in room_free.items()}
+        self.instructor_free = {instructor: dict(masks) for instructor, masks in instructor_free.items()}
+        self.days = list(days)
+        self.granularity = granularity
+        self.gap_slots = -(-cleaning_gap // granularity)
+        self.backtrack_budget = backtrack_budget
+        self.nodes = 0
+        self.backtracks = 0
+        self._last_slot = DAY_MINUTES // granularity
+        self._after_close = ~((1 << self._last_slot) - 1)
+        self._day_load = {day: 0 for day in self.days}
+        self._course_days = {}
+
+    def _slots(self, minutes):
+        return -(-minutes // self.granularity)
+
+    def _candidates(self, demand):
+        length = self._slots(demand.duration)
+        need = (1 << length) - 1
+        with_gap = (1 << (length + self.gap_slots)) - 1
+        taken_days = self._course_days.get(demand.course, {})
+        spread = demand.sessions <= len(self.days)
+        days = sorted(self.days, key=lambda day: (taken_days.get(day, 0), self._day_load[day]))
+        for day in days:
+            if spread and taken_days.get(day):
+                continue
+            teacher_starts = run_starts(self.instructor_free[demand.instructor][day], length)
+            if not teacher_starts:
+                continue
+            for room in demand.rooms:
+                room_free = self.room_free[room][day]
+                # The cleaning gap may run past midnight; those slots do not exist, so count them as free.
+                starts = run_starts(room_free | self._after_close, length + self.gap_slots) & teacher_starts
+                starts &= (1 << (self._last_slot - length + 1)) - 1
+                while starts:
+                    lowest = starts & -starts
+                    starts ^= lowest
+                    slot = lowest.bit_length() - 1
+                    room_need = (with_gap << slot) & ~self._after_close
+                    yield day, room, slot, room_need, need << slot
+
+    def _apply(self, demand, candidate, sign):
+        day, room, slot, room_need, teacher_need = candidate
+        self.room_free[room][day] ^= room_need
+        self.instructor_free[demand.instructor][day] ^= teacher_need
+        self._day_load[day] += sign
+        course_days = self._course_days.setdefault(demand.course, {})
+        course_days[day] = course_days.get(day, 0) + sign
+
+    def _flexibility(self, demand):
+        count = 0
+        for _ in self._candidates(demand):
+            count += 1
+            if count >= 64:
+                break
+        return count
+
+    def solve(self, demands):
+        """Return (placements, unplaced demands), one entry per session."""
+        sessions = [demand for demand in demands for _ in range(demand.sessions)]
+        sessions.sort(key=lambda demand: (self._flexibility(demand), -demand.duration))
+
+        assigned = [None] * len(sessions)
+        pending = [None] * len(sessions)
+        unplaced = []
+        position = 0
+        while position < len(sessions):
+            demand = sessions[position]
+            if pending[position] is None:
+                pending[position] = self._candidates(demand)
+            candidate = next(pending[position], None)
+            if candidate is not None:
+                self.nodes += 1
+                self._apply(demand, candidate, 1)
+                assigned[position] = candidate
+                position += 1
+                continue
+
+            pending[position] = None
+            previous = position - 1
+            if self.backtracks >= self.backtrack_budget or previous < 0 or assigned[previous] is None:
+                unplaced.append(demand)
+                position += 1
+                continue
+            self.backtracks += 1
+            self._apply(sessions[previous], assigned[previous], -1)
+            assigned[previous] = None
+            position = previous
+
+        placements = []
+        for demand, candidate in zip(sessions, assigned):
+            if candidate is not None:
+                day, room, slot, _, _ = candidate
+                start = slot * self.granularity
+                placements.append(Placement(demand.course, demand.instructor, room, day, start, start + demand.duration))
+        placements.sort(key=lambda placement: (placement.day, placement.start, placement.room))
+        return placements, unplaced
@@ -0,0 +1,7 @@
+"""WSGI entry point for pre-fork servers, see gunicorn.conf.py."""
+from app import create_app, initialize_database
+
+app = create_app()
+
+with app.app_context():
+    initialize_database()